@@ -14,6 +14,28 @@ export interface ItemWithSellers extends ParsedItem {
   sellers: Seller[];
 }
 
+export interface RevisionDiff {
+  base_revision: string | null;
+  total_rows: number;
+  rows_parsed: number;
+  sellers_looked_up: number;
+  added?: number;
+  changed?: number;
+  unchanged?: number;
+  removed?: number;
+  base_revision_missing?: string;
+}
+
+export class ApiError extends Error {
+  status: number;
+
+  constructor(message: string, status: number) {
+    super(message);
+    this.name = 'ApiError';
+    this.status = status;
+  }
+}
+
 export const apiClient = {
   /**
    * Health check endpoint
@@ -72,11 +94,20 @@ export const apiClient = {
   },
 
   /**
-   * Complete pipeline: parse BOM and get seller info
+   * Complete pipeline: parse BOM and get seller info.
+   * Pass the revision id of a previous upload to only process changed rows.
    */
-  async processBOM(file: File): Promise<{ parsed_data: ParsedItem[]; seller_info: ItemWithSellers[] }> {
+  async processBOM(file: File, baseRevision?: string): Promise<{
+    revision_id: string;
+    parsed_data: ParsedItem[];
+    seller_info: ItemWithSellers[];
+    diff: RevisionDiff;
+  }> {
     const formData = new FormData();
     formData.append('file', file);
+    if (baseRevision) {
+      formData.append('base_revision', baseRevision);
+    }
 
     const response = await fetch(`${API_BASE_URL}/api/process-bom`, {
       method: 'POST',
@@ -85,13 +116,15 @@ export const apiClient = {
 
     if (!response.ok) {
       const error = await response.json();
-      throw new Error(error.error || 'Failed to process BOM');
+      throw new ApiError(error.error || 'Failed to process BOM', response.status);
     }
 
     const result = await response.json();
     return {
+      revision_id: result.revision_id,
       parsed_data: result.parsed_data,
       seller_info: result.seller_info,
+      diff: result.diff,
     };
   },
 };
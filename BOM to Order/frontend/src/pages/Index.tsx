@@ -5,7 +5,7 @@ import SellerResults from "@/components/SellerResults";
 import { Package, Loader2 } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { useToast } from "@/hooks/use-toast";
-import { apiClient, ItemWithSellers } from "@/lib/api";
+import { apiClient, ApiError, ItemWithSellers } from "@/lib/api";
 import * as XLSX from "xlsx";
 
 const Index = () => {
@@ -13,6 +13,7 @@ const Index = () => {
   const [bomData, setBomData] = useState<string[][]>([]);
   const [isProcessing, setIsProcessing] = useState(false);
   const [sellerResults, setSellerResults] = useState<ItemWithSellers[]>([]);
+  const [lastRevisionId, setLastRevisionId] = useState<string | undefined>();
   const { toast } = useToast();
 
   const handleFileSelect = async (file: File) => {
@@ -61,7 +62,9 @@ const Index = () => {
 
     setIsProcessing(true);
     try {
-      const result = await apiClient.processBOM(selectedFile);
+      // Diff against the previous upload so only changed rows are reprocessed
+      const result = await apiClient.processBOM(selectedFile, lastRevisionId);
+      setLastRevisionId(result.revision_id);
       setSellerResults(result.seller_info);
       toast({
         title: "Processing complete!",
@@ -69,6 +72,10 @@ const Index = () => {
       });
     } catch (error) {
       console.error("Error processing BOM:", error);
+      if (error instanceof ApiError && error.status === 404) {
+        // The server no longer has the base revision, next upload processes every row
+        setLastRevisionId(undefined);
+      }
       toast({
         title: "Processing failed",
         description: error instanceof Error ? error.message : "An unknown error occurred",
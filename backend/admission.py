@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from functools import wraps
+from flask import jsonify
+
+# Defaults can be overridden with environment variables
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("BOM_MAX_IN_FLIGHT", "2"))
+DEFAULT_MAX_QUEUE = int(os.getenv("BOM_MAX_QUEUE", "8"))
+DEFAULT_QUEUE_TIMEOUT = float(os.getenv("BOM_QUEUE_TIMEOUT", "30"))
+
+class AdmissionController:
+    """Bound the number of running and waiting requests for LLM-bound endpoints."""
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, max_queue=DEFAULT_MAX_QUEUE,
+                 queue_timeout=DEFAULT_QUEUE_TIMEOUT):
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        # Condition.notify wakes waiters in FIFO order, so the queue is fair
+        self._cond = threading.Condition()
+        self.in_flight = 0
+        self.waiting = 0
+
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.peak_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        # Moving average of how long an admitted request holds its slot
+        self.avg_service_seconds = 0.0
+
+    def acquire(self):
+        """Take an in-flight slot, waiting in the queue if needed.
+
+        Returns (admitted, reason) where reason is "queue_full" or "timeout"
+        when the request was turned away.
+        """
+        with self._cond:
+            # Only skip the queue when nobody is already waiting
+            if self.in_flight < self.max_in_flight and self.waiting == 0:
+                self.in_flight += 1
+                self.admitted += 1
+                return True, None
+
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False, "queue_full"
+
+            self.waiting += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.waiting)
+            start = time.monotonic()
+            deadline = start + self.queue_timeout
+            try:
+                while self.in_flight >= self.max_in_flight:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        return False, "timeout"
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+
+            self.in_flight += 1
+            self.admitted += 1
+            self.total_wait_seconds += time.monotonic() - start
+            return True, None
+
+    def release(self, service_seconds=None):
+        """Give back an in-flight slot and wake the next queued request."""
+        with self._cond:
+            self.in_flight -= 1
+            if service_seconds is not None:
+                if self.avg_service_seconds == 0.0:
+                    self.avg_service_seconds = service_seconds
+                else:
+                    self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * service_seconds
+            self._cond.notify()
+
+    def retry_after(self):
+        """Estimate in whole seconds when a rejected client should try again."""
+        with self._cond:
+            backlog = self.waiting + self.in_flight
+            estimate = self.avg_service_seconds * backlog / self.max_in_flight
+        return max(1, int(round(estimate)))
+
+    def metrics(self):
+        """Snapshot of queue depth and admission counters."""
+        with self._cond:
+            return {
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+                "max_in_flight": self.max_in_flight,
+                "max_queue": self.max_queue,
+                "peak_queue_depth": self.peak_queue_depth,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_wait_seconds": round(self.total_wait_seconds / self.admitted, 3) if self.admitted else 0.0,
+                "avg_service_seconds": round(self.avg_service_seconds, 3),
+            }
+
+    def limit(self, view):
+        """Decorator that runs a Flask view only once a slot has been granted."""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            admitted, reason = self.acquire()
+            if not admitted:
+                if reason == "queue_full":
+                    body, status = {"error": "Server busy, too many requests queued"}, 429
+                else:
+                    body, status = {"error": "Timed out waiting for a processing slot"}, 503
+                response = jsonify(body)
+                response.status_code = status
+                response.headers["Retry-After"] = str(self.retry_after())
+                return response
+
+            start = time.monotonic()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                self.release(time.monotonic() - start)
+        return wrapper
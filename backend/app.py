@@ -3,8 +3,11 @@ from flask_cors import CORS
 import os
 import tempfile
 from werkzeug.utils import secure_filename
-from csv_parser import process_csv
+from csv_parser import process_csv, load_rows, row_hash
 from gemini_seller import get_seller_info, configure_gemini
+from admission import AdmissionController
+from warmup import default_tracker
+from bom_revisions import RevisionStore, RevisionNotFound, diff_rows, process_incremental
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend communication
@@ -15,6 +18,16 @@ ALLOWED_EXTENSIONS = {'csv', 'txt', 'xlsx', 'xls'}
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+DEBUG = os.environ.get('FLASK_DEBUG', '1') != '0'
+
+# Shared gate for endpoints that call Ollama or Gemini
+llm_admission = AdmissionController()
+
+# Processed BOM revisions for incremental re-uploads
+revisions = RevisionStore()
+
+# Startup warm-up of Ollama, Gemini and parser caches
+warmup = default_tracker()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -24,7 +37,22 @@ def health_check():
     """Health check endpoint."""
     return jsonify({"status": "healthy"}), 200
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness endpoint reporting each dependency's warm-up state."""
+    status = warmup.status()
+    return jsonify({
+        "status": status,
+        "dependencies": warmup.report()
+    }), 200 if status == "ready" else 503
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Report admission queue depth and counters."""
+    return jsonify({"admission": llm_admission.metrics()}), 200
+
 @app.route('/api/parse-bom', methods=['POST'])
+@llm_admission.limit
 def parse_bom():
     """Parse uploaded BOM file and extract part names and quantities."""
     try:
@@ -60,6 +88,7 @@ def parse_bom():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/get-sellers', methods=['POST'])
+@llm_admission.limit
 def get_sellers():
     """Get seller information for parsed BOM items."""
     try:
@@ -87,6 +116,7 @@ def get_sellers():
         return jsonify({"error": str(e)}), 500
 
 @app.route('/api/process-bom', methods=['POST'])
+@llm_admission.limit
 def process_bom_complete():
     """Complete pipeline: parse BOM and get seller info in one call."""
     try:
@@ -107,31 +137,79 @@ def process_bom_complete():
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
         
-        # Step 1: Parse the CSV file
-        parsed_data = process_csv(filepath)
+        # Parse and look up sellers, reusing a previous revision if one is referenced
+        base_revision = request.form.get('base_revision')
         
-        # Clean up temporary file
-        os.remove(filepath)
+        try:
+            rows = load_rows(filepath)
+        finally:
+            # Clean up temporary file
+            os.remove(filepath)
         
-        # Step 2: Get seller information
-        seller_info = get_seller_info(parsed_data)
+        try:
+            result = process_incremental(revisions, rows, base_revision)
+        except RevisionNotFound:
+            # The base revision was evicted or lost on restart, process every row instead
+            result = process_incremental(revisions, rows)
+            result["diff"]["base_revision_missing"] = base_revision
         
         return jsonify({
             "success": True,
-            "parsed_data": parsed_data,
-            "seller_info": seller_info
+            **result
         }), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
-if __name__ == '__main__':
-    # Try to configure Gemini on startup
+@app.route('/api/bom-diff', methods=['POST'])
+def bom_diff():
+    """Row-level diff of an uploaded BOM against a stored revision."""
     try:
-        configure_gemini()
-        print("✅ Gemini API configured successfully")
+        if 'file' not in request.files:
+            return jsonify({"error": "No file provided"}), 400
+        
+        base_revision = request.form.get('base_revision')
+        if not base_revision:
+            return jsonify({"error": "No base_revision provided"}), 400
+        
+        base = revisions.get(base_revision)
+        if base is None:
+            return jsonify({"error": f"Unknown base revision: {base_revision}"}), 404
+        
+        file = request.files['file']
+        
+        if file.filename == '' or not allowed_file(file.filename):
+            return jsonify({"error": "Invalid file type"}), 400
+        
+        filename = secure_filename(file.filename)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        file.save(filepath)
+        try:
+            rows = load_rows(filepath)
+        finally:
+            os.remove(filepath)
+        
+        row_diff = diff_rows(base["row_hashes"], [row_hash(row) for row in rows])
+        
+        return jsonify({
+            "success": True,
+            "base_revision": base_revision,
+            "added": [rows[i] for i in row_diff["added"]],
+            "changed": [rows[i] for i in row_diff["changed"]],
+            "unchanged": len(row_diff["unchanged"]),
+            "removed": row_diff["removed"]
+        }), 200
+        
     except Exception as e:
-        print(f"⚠️  Warning: Could not configure Gemini API: {e}")
-        print("    API key can be provided via request")
+        return jsonify({"error": str(e)}), 500
+
+def start_warmup():
+    print("🔥 Warming up Ollama, Gemini and parser caches (see /ready)")
+    warmup.start()
+
+if __name__ == '__main__':
+    # The debug reloader's parent process only watches files, warm up in the process that serves requests
+    if not DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_warmup()
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(debug=DEBUG, host='0.0.0.0', port=5000)
@@ -0,0 +1,130 @@
+import difflib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from csv_parser import row_hash, parse_rows
+from gemini_seller import get_seller_info
+
+MAX_REVISIONS = int(os.getenv("BOM_MAX_REVISIONS", "50"))
+
+class RevisionNotFound(KeyError):
+    """The base revision is unknown or was evicted."""
+
+class RevisionStore:
+    """Keep recent BOM revisions with their parsed rows and seller results."""
+
+    def __init__(self, max_revisions=MAX_REVISIONS):
+        self.max_revisions = max(1, max_revisions)
+        self._lock = threading.Lock()
+        self._revisions = OrderedDict()
+
+    def get(self, revision_id):
+        """Return a stored revision, or None if it is unknown or was evicted."""
+        with self._lock:
+            revision = self._revisions.get(revision_id)
+            if revision is not None:
+                self._revisions.move_to_end(revision_id)
+            return revision
+
+    def save(self, row_hashes, parsed_data, seller_info):
+        """Store a processed revision and return its id."""
+        revision_id = uuid.uuid4().hex[:12]
+        revision = {
+            "id": revision_id,
+            "created_at": time.time(),
+            "row_hashes": list(row_hashes),
+            "parsed": dict(zip(row_hashes, parsed_data)),
+            "sellers": {entry["name"]: entry["sellers"] for entry in seller_info},
+        }
+        with self._lock:
+            self._revisions[revision_id] = revision
+            # Drop the least recently used revisions beyond the limit
+            while len(self._revisions) > self.max_revisions:
+                self._revisions.popitem(last=False)
+        return revision_id
+
+def diff_rows(base_hashes, new_hashes):
+    """Row-level diff of two revisions by row hash.
+
+    Returns indices into the new revision for added, changed and unchanged rows,
+    plus the number of base rows that were removed.
+    """
+    added, changed, unchanged = [], [], []
+    removed = 0
+
+    # autojunk would treat repeated rows in big BOMs as noise
+    matcher = difflib.SequenceMatcher(None, base_hashes, new_hashes, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            unchanged.extend(range(j1, j2))
+        elif tag == "insert":
+            added.extend(range(j1, j2))
+        elif tag == "delete":
+            removed += i2 - i1
+        else:
+            # A replaced block pairs rows up as changed; any surplus is added or removed
+            paired = min(i2 - i1, j2 - j1)
+            changed.extend(range(j1, j1 + paired))
+            added.extend(range(j1 + paired, j2))
+            removed += (i2 - i1) - paired
+
+    return {"added": added, "changed": changed, "unchanged": unchanged, "removed": removed}
+
+def process_incremental(store, rows, base_revision_id=None):
+    """Parse rows and look up sellers, reusing results from a base revision.
+
+    Only rows whose content is not in the base revision go through the LLM, and
+    only part names the base revision has no sellers for go to Gemini.
+    Rows the base revision failed to parse and parts it found no sellers for are retried.
+    Raises RevisionNotFound if base_revision_id is not in the store.
+    """
+    hashes = [row_hash(row) for row in rows]
+
+    base = None
+    if base_revision_id:
+        base = store.get(base_revision_id)
+        if base is None:
+            raise RevisionNotFound(base_revision_id)
+    # Only carry forward successes, so earlier failures are not reused forever
+    base_parsed = {digest: item for digest, item in base["parsed"].items() if item.get("name")} if base else {}
+    base_sellers = {name: sellers for name, sellers in base["sellers"].items() if sellers} if base else {}
+
+    # Identical rows only need to be parsed once
+    to_parse = {}
+    for digest, row in zip(hashes, rows):
+        if digest not in base_parsed and digest not in to_parse:
+            to_parse[digest] = row
+    parsed_by_hash = dict(zip(to_parse, parse_rows(list(to_parse.values()))))
+    parsed_data = [dict(parsed_by_hash[digest] if digest in parsed_by_hash else base_parsed[digest]) for digest in hashes]
+
+    lookup, seen = [], set()
+    for item in parsed_data:
+        name = item.get("name")
+        if name and name not in base_sellers and name not in seen:
+            seen.add(name)
+            lookup.append(item)
+    sellers_by_name = dict(base_sellers)
+    sellers_by_name.update({entry["name"]: entry["sellers"] for entry in get_seller_info(lookup)})
+
+    seller_info = [
+        {"name": item["name"], "quantity": item.get("quantity"), "sellers": sellers_by_name.get(item["name"], [])}
+        for item in parsed_data if item.get("name")
+    ]
+
+    revision_id = store.save(hashes, parsed_data, seller_info)
+
+    summary = {"base_revision": base_revision_id, "total_rows": len(rows),
+               "rows_parsed": len(to_parse), "sellers_looked_up": len(lookup)}
+    if base:
+        row_diff = diff_rows(base["row_hashes"], hashes)
+        summary.update(added=len(row_diff["added"]), changed=len(row_diff["changed"]),
+                       unchanged=len(row_diff["unchanged"]), removed=row_diff["removed"])
+
+    return {
+        "revision_id": revision_id,
+        "parsed_data": parsed_data,
+        "seller_info": seller_info,
+        "diff": summary,
+    }
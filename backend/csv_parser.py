@@ -1,6 +1,7 @@
 import pandas as pd
 import subprocess
 import json
+import hashlib
 
 MODEL = "llama3.2:1b"
 
@@ -45,14 +46,28 @@ Rules:
         parsed = {"name": None, "quantity": None}
     return pd.Series(parsed)
 
-def process_csv(file_path):
-    """Process CSV file and return parsed data as list of dicts."""
-    # Load CSV as DataFrame
-    df = pd.read_csv(file_path)
+def load_rows(file_path):
+    """Read a BOM CSV as a list of row dicts with string values."""
+    # Read everything as text so a blank cell cannot turn 5 into 5.0 and change row hashes
+    df = pd.read_csv(file_path, dtype=str, keep_default_na=False)
+    return df.to_dict(orient="records")
+
+def row_hash(row):
+    """Stable content hash of a BOM row, independent of column order and cell padding."""
+    normalized = {str(key).strip(): str(value).strip() for key, value in row.items()}
+    encoded = json.dumps(normalized, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+def parse_rows(rows):
+    """Parse a list of row dicts with the LLM and return name/quantity dicts."""
     results = []
 
-    for _, row in df.iterrows():
-        parsed = parse_row_with_llm(row)
+    for row in rows:
+        parsed = parse_row_with_llm(pd.Series(row))
         results.append({"name": parsed["name"], "quantity": parsed["quantity"]})
 
     return results
+
+def process_csv(file_path):
+    """Process CSV file and return parsed data as list of dicts."""
+    return parse_rows(load_rows(file_path))
@@ -0,0 +1,87 @@
+import io
+import threading
+import time
+import pandas as pd
+from csv_parser import query_ollama
+from gemini_seller import configure_gemini
+
+class WarmupTracker:
+    """Run startup warm-up steps in the background and report their state."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._steps = {}
+        self._state = {}
+        self._threads = []
+
+    def register(self, name, fn, required=True):
+        """Add a warm-up step. Optional steps may fail without blocking readiness."""
+        with self._lock:
+            self._steps[name] = (fn, required)
+            self._state[name] = {"status": "pending", "required": required, "seconds": None, "error": None}
+
+    def _run_step(self, name, fn):
+        with self._lock:
+            self._state[name]["status"] = "warming"
+        start = time.monotonic()
+        try:
+            fn()
+            status, error = "ready", None
+        except Exception as e:
+            status, error = "failed", str(e)
+        with self._lock:
+            self._state[name].update(status=status, error=error,
+                                     seconds=round(time.monotonic() - start, 3))
+
+    def start(self):
+        """Start every registered step in its own daemon thread, once."""
+        if self._threads:
+            return
+        for name, (fn, _) in list(self._steps.items()):
+            thread = threading.Thread(target=self._run_step, args=(name, fn),
+                                      name=f"warmup-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def is_ready(self):
+        """True once every required step has finished successfully."""
+        with self._lock:
+            return all(s["status"] == "ready" for s in self._state.values() if s["required"])
+
+    def status(self):
+        """"ready", "failed" once every required step has finished and one failed, else "warming"."""
+        with self._lock:
+            required = [s["status"] for s in self._state.values() if s["required"]]
+        if all(status == "ready" for status in required):
+            return "ready"
+        if all(status in ("ready", "failed") for status in required):
+            return "failed"
+        return "warming"
+
+    def report(self):
+        """Per-dependency warm state and measured warm-up time."""
+        with self._lock:
+            return {name: dict(state) for name, state in self._state.items()}
+
+def warm_ollama():
+    """Load the local model into memory with a tiny prompt."""
+    output = query_ollama("Reply with the single word OK.")
+    if not output:
+        raise RuntimeError("Ollama returned no output")
+
+def warm_gemini():
+    """Build the Gemini client from API_Key.txt."""
+    configure_gemini()
+
+def warm_parser():
+    """Prime pandas' CSV reader so the first upload does not pay for it."""
+    pd.read_csv(io.StringIO("part,qty\nresistor,1\n"))
+
+def default_tracker():
+    """Tracker with the backend's standard warm-up steps registered."""
+    tracker = WarmupTracker()
+    tracker.register("ollama", warm_ollama)
+    # The Gemini key can also arrive with a request, so this step is optional
+    tracker.register("gemini", warm_gemini, required=False)
+    tracker.register("parser", warm_parser)
+    return tracker
@@ -0,0 +1,7 @@
+"""WSGI entry point: `gunicorn -w 4 -b 0.0.0.0:5000 wsgi:app`.
+
+Importing app alone does not warm up (tests and scripts import it too), so this starts it.
+"""
+from app import app, start_warmup
+
+start_warmup()
@@ -0,0 +1,341 @@
+import asyncio
+from playwright.async_api import async_playwright
+from typing import Dict, Optional
+from url_utils import registrable_domain
+from playwright_mcp_bridge import STEALTH_SCRIPT
+from browser_profiles import ProfileStore
+from resource_filter import ResourceFilter
+from wait_strategy import AsyncPageWaits, get_profile
+from selector_race import race_selectors_async, SEARCH_BOX_TIMEOUT_MS, CART_BUTTON_TIMEOUT_MS
+from site_selectors import (CLOUDFLARE_INDICATORS, POPUP_SELECTORS, SEARCH_SELECTORS, PRODUCT_SELECTORS,
+                            NAME_SELECTORS, PRICE_SELECTORS, CART_BUTTON_SELECTORS, CART_LINK_SELECTORS, site_key,
+                            search_url)
+
+
+# sites where we type slowly like a human instead of filling the box
+HUMAN_TYPING_SITES = {'digikey', 'generic'}
+
+
+class AsyncPlaywrightMCPBridge:
+    # asyncio version of PlaywrightMCPBridge: one event loop can drive many pages at once
+    def __init__(self, headless=False, resource_filter: ResourceFilter = None, pacing: str = None,
+                 profiles: ProfileStore = None):
+        self.headless = headless
+        self.pacing = pacing
+        self.resource_filter = resource_filter
+        # saved per-site cookies/consent state, loaded into each forked site context
+        self.profiles = profiles
+        self.site_url = None
+        self.warm = False
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        # true when the last extraction saw a real results page with no product,
+        # not a cloudflare challenge or an error
+        self.results_empty = False
+        # true once search_product has waited for this page's results
+        self.results_waited = False
+        # forked bridges share the browser and only own their context
+        self.owns_browser = True
+        # kept per-site forks for carts, so a cart outlives the search tab that found its product
+        self.cart_tabs = {}
+        self.cart_locks = {}
+
+        # pacing profile: waits on page events, with short random pauses in between
+        self.waits = AsyncPageWaits(get_profile(pacing))
+
+    async def start(self):
+        # start playwright and launch browser with stealth settings
+        print(f"  launching async browser (headless={self.headless})...")
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=self.headless,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--disable-web-security',
+                '--disable-features=IsolateOrigins,site-per-process',
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--disable-accelerated-2d-canvas',
+                '--disable-gpu'
+            ]
+        )
+        await self._open_context()
+
+    async def _open_context(self, site_url: str = None):
+        # create context with realistic browser fingerprint
+        # and the site's saved profile if there is one
+        state = self.profiles.state_for(site_url) if self.profiles and site_url else None
+        self.site_url = site_url
+        self.warm = bool(state)
+        self.context = await self.browser.new_context(
+            storage_state=state,
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            locale='en-US',
+            timezone_id='America/Los_Angeles',
+            extra_http_headers={
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'DNT': '1',
+                'Upgrade-Insecure-Requests': '1',
+            }
+        )
+        if self.resource_filter:
+            await self.resource_filter.install_async(self.context, site_url)
+        self.page = await self.context.new_page()
+        await self.page.add_init_script(STEALTH_SCRIPT)
+
+    async def fork(self, site_url: str = None) -> 'AsyncPlaywrightMCPBridge':
+        # new bridge with its own context and page on this bridge's browser
+        child = AsyncPlaywrightMCPBridge(headless=self.headless, resource_filter=self.resource_filter,
+                                         pacing=self.pacing, profiles=self.profiles)
+        child.playwright = self.playwright
+        child.browser = self.browser
+        child.owns_browser = False
+        await child._open_context(site_url)
+        return child
+
+    async def cart_tab(self, site_url: str) -> 'AsyncPlaywrightMCPBridge':
+        # this site's kept cart fork, created on first use; hold cart_lock(site_url) while using it
+        site = registrable_domain(site_url)
+        tab = self.cart_tabs.get(site)
+        if tab is None or tab.page.is_closed():
+            tab = self.cart_tabs[site] = await self.fork(site_url)
+        return tab
+
+    def cart_lock(self, site_url: str) -> asyncio.Lock:
+        return self.cart_locks.setdefault(registrable_domain(site_url), asyncio.Lock())
+
+    async def navigate(self, url: str) -> bool:
+        # navigate to url with human-like behavior
+        try:
+            print(f"  navigating to {url}")
+            self.results_waited = False
+            await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            await self.waits.network_quiet(self.page)
+            await self.waits.settle()
+
+            if await self._detect_cloudflare():
+                print(f"  ⚠️  cloudflare challenge detected - waiting for resolution...")
+                await self.waits.challenge_cleared(self.page)
+
+            # handle cookie banners and popups, already accepted in a warm profile
+            if not self.warm:
+                await self._dismiss_popups()
+            return True
+        except Exception as e:
+            print(f"  error navigating: {e}")
+            return False
+
+    async def _detect_cloudflare(self) -> bool:
+        # detect if we're on a cloudflare challenge page
+        try:
+            page_content = (await self.page.content()).lower()
+            return any(indicator in page_content for indicator in CLOUDFLARE_INDICATORS)
+        except:
+            return False
+
+    async def _dismiss_popups(self):
+        # try to dismiss common popups, cookie banners, etc
+        for selector in POPUP_SELECTORS:
+            try:
+                button = await self.page.query_selector(selector)
+                if button and await button.is_visible():
+                    print(f"  dismissing popup/banner...")
+                    await button.click()
+                    await self.waits.think()
+                    break
+            except:
+                continue
+
+    async def search_product(self, search_term: str, site_url: str = None, direct: bool = True) -> bool:
+        # open the site's results page directly when it has a template,
+        # otherwise find the search box on the current page
+        try:
+            print(f"  searching for: {search_term}")
+            previous_url = self.page.url
+            results_url = search_url(site_url or previous_url, search_term) if direct else None
+            if results_url:
+                searched = await self.navigate(results_url)
+            else:
+                site = site_key(previous_url)
+                human_typing = site in HUMAN_TYPING_SITES
+                if human_typing:
+                    await self.waits.think()
+                if site == 'digikey':
+                    await self._dismiss_popups()
+                searched = await self._search_with_selectors(search_term, site, human_typing)
+            if searched:
+                # the one wait for results, extract_product_info doesn't repeat it
+                self.results_waited = True
+                await self.waits.results_ready(self.page, PRODUCT_SELECTORS[site_key(self.page.url)], previous_url)
+            return searched
+        except Exception as e:
+            print(f"  error searching: {e}")
+            return False
+
+    async def _search_with_selectors(self, search_term: str, site: str, human_typing: bool) -> bool:
+        match = await race_selectors_async(self.page, SEARCH_SELECTORS[site], SEARCH_BOX_TIMEOUT_MS)
+        if match:
+            _, element = match
+            try:
+                await element.click()
+                typing_delay = self.waits.typing_delay() if human_typing else 0
+                if typing_delay:
+                    await self.waits.think()
+                    await element.fill('')
+                    await element.type(search_term, delay=typing_delay)
+                    await self.waits.think()
+                else:
+                    await element.fill(search_term)
+                await element.press('Enter')
+                print(f"  search submitted")
+                return True
+            except Exception as e:
+                print(f"  search box error: {e}")
+                return False
+        print(f"  no search box found")
+        return False
+
+    async def extract_product_info(self) -> Dict[str, Optional[str]]:
+        # extract product information from search results page
+        empty = {'product_name': None, 'price': None, 'product_url': None}
+        try:
+            self.results_empty = False
+            print(f"  extracting product info...")
+            if await self._detect_cloudflare():
+                print(f"  ⚠️  still on cloudflare challenge - consider using --show-browser")
+                return empty
+
+            product_selectors = PRODUCT_SELECTORS[site_key(self.page.url)]
+            if not self.results_waited:
+                await self.waits.results_ready(self.page, product_selectors)
+            self.results_waited = False
+
+            product_element = None
+            for selector in product_selectors:
+                try:
+                    for elem in (await self.page.query_selector_all(selector))[:5]:
+                        if await elem.is_visible():
+                            product_element = elem
+                            break
+                    if product_element:
+                        print(f"  found product with selector: {selector}")
+                        break
+                except:
+                    continue
+
+            if not product_element:
+                print(f"  no product found")
+                self.results_empty = True
+                return empty
+
+            product_name = None
+            for selector in NAME_SELECTORS:
+                try:
+                    name_elem = await product_element.query_selector(selector)
+                    if name_elem:
+                        product_name = (await name_elem.inner_text()).strip()
+                        if product_name:
+                            break
+                except:
+                    continue
+
+            price = None
+            for selector in PRICE_SELECTORS:
+                try:
+                    price_elem = await product_element.query_selector(selector)
+                    if price_elem:
+                        price_text = (await price_elem.inner_text()).strip()
+                        if '$' in price_text or any(c.isdigit() for c in price_text):
+                            price = price_text
+                            break
+                except:
+                    continue
+
+            product_url = None
+            try:
+                link_elem = await product_element.query_selector('a')
+                if link_elem:
+                    href = await link_elem.get_attribute('href')
+                    if href:
+                        product_url = self._absolute_url(href)
+            except:
+                pass
+
+            print(f"  found: {product_name} - {price}")
+            return {'product_name': product_name, 'price': price, 'product_url': product_url}
+        except Exception as e:
+            print(f"  error extracting product info: {e}")
+            return empty
+
+    def _absolute_url(self, href: str) -> str:
+        # make absolute url if relative
+        if href.startswith('http'):
+            return href
+        if href.startswith('/'):
+            return f"{self.page.url.split('/')[0]}//{self.page.url.split('/')[2]}{href}"
+        return f"{self.page.url.rsplit('/', 1)[0]}/{href}"
+
+    async def add_to_cart(self, product_url: str = None) -> Dict[str, any]:
+        # navigate to product and add to cart
+        try:
+            if product_url:
+                print(f"  navigating to product page...")
+                await self.page.goto(product_url, wait_until='domcontentloaded', timeout=30000)
+
+            print(f"  looking for add to cart button...")
+            # race every add to cart button selector under one deadline, which also
+            # covers waiting for the product page to render
+            match = await race_selectors_async(self.page, CART_BUTTON_SELECTORS, CART_BUTTON_TIMEOUT_MS)
+            button_found = False
+            if match:
+                _, button = match
+                await button.click()
+                # the cart update is an xhr, wait for it to land
+                await self.waits.network_quiet(self.page)
+                await self.waits.settle()
+                button_found = True
+                print(f"  item added to cart!")
+
+            if not button_found:
+                print(f"  could not find add to cart button")
+                return {'success': False, 'cart_url': None, 'message': 'Add to cart button not found'}
+
+            cart_url = None
+            for selector in CART_LINK_SELECTORS:
+                try:
+                    cart_link = await self.page.query_selector(selector)
+                    if cart_link:
+                        cart_url = await cart_link.get_attribute('href')
+                        if cart_url:
+                            cart_url = self._absolute_url(cart_url)
+                        break
+                except:
+                    continue
+
+            return {'success': True, 'cart_url': cart_url, 'message': 'Item added to cart successfully'}
+        except Exception as e:
+            print(f"  error adding to cart: {e}")
+            return {'success': False, 'cart_url': None, 'message': str(e)}
+
+    async def close(self):
+        # close this bridge's context and cart tabs, and the browser if we launched it
+        for tab in self.cart_tabs.values():
+            await tab.close()
+        self.cart_tabs = {}
+        try:
+            if self.context:
+                if self.profiles and self.site_url and not self.page.is_closed():
+                    await self.profiles.save_async(self.site_url, self.context)
+                await self.context.close()
+            if self.owns_browser:
+                if self.browser:
+                    await self.browser.close()
+                if self.playwright:
+                    await self.playwright.stop()
+        except:
+            pass
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import os
+import random
+import resource
+import tempfile
+import time
+from bom_ingest import sniff_file
+from bom_parser import BOMParser
+
+
+# synthetic stand-ins for the erp/cad exports we see in practice:
+# (label, encoding, delimiter, headers)
+EXPORT_PROFILES = [
+    ('kicad utf-8 comma', 'utf-8', ',', ['Reference', 'Value', 'Footprint', 'Qty', 'Description']),
+    ('erp cp1252 semicolon', 'cp1252', ';', ['Pos.', 'Artikel Nr.', ' Part  Name ', 'Menge', 'QTY', 'Einheit']),
+    ('altium utf-8-sig tab', 'utf-8-sig', '\t', ['Designator', 'Comment', 'PART_NAME', 'Quantity']),
+    ('excel utf-8 quoted', 'utf-8', ',', ['Item', 'Manufacturer', 'MPN', 'Qty.', 'Notes']),
+]
+
+PART_WORDS = ['Resistor 10kΩ 0603', 'Capacitor 100nF 50V', 'Arduino Uno R3', 'M3x8 Screw, DIN 912',
+              'Header 2.54mm "1x40"', 'Temp sensor ±0.5°C', 'Ferrite bead 600Ω', 'LED red 0805']
+
+
+def generate_export(path: str, encoding: str, delimiter: str, headers, rows: int):
+    # write a synthetic bom export with quoting, embedded delimiters and non-ascii text
+    rng = random.Random(rows)
+    with open(path, 'w', encoding=encoding, errors='replace', newline='') as file:
+        writer = csv.writer(file, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(headers)
+        for i in range(rows):
+            row = []
+            for header in headers:
+                key = header.strip().lower()
+                if 'qty' in key or 'quant' in key or 'menge' in key:
+                    row.append(str(rng.randint(1, 500)))
+                elif 'part' in key or key in ('value', 'comment', 'item', 'mpn'):
+                    row.append(f"{rng.choice(PART_WORDS)} #{i % 5000}")
+                else:
+                    row.append(f"{header.strip()}-{rng.randint(0, 99999)}")
+            writer.writerow(row)
+
+
+def bench_file(path: str, label: str):
+    # time sniffing and a full streaming pass over one export
+    start = time.perf_counter()
+    encoding, dialect = sniff_file(path)
+    sniff_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count = 0
+    with_qty = 0
+    for record in BOMParser(path).iter_parts():
+        count += 1
+        if record.quantity:
+            with_qty += 1
+    parse_time = time.perf_counter() - start
+
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    print(f"{label:<24} {size_mb:8.1f} MB  enc={encoding:<9} delim={dialect.delimiter!r:<5}"
+          f" sniff={sniff_time * 1000:7.1f} ms  parse={parse_time:6.2f} s"
+          f"  {size_mb / parse_time if parse_time else 0:6.1f} MB/s  rows={count} qty={with_qty}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='benchmark bom ingestion (encoding/dialect sniffing and streaming parse)')
+    parser.add_argument('files', nargs='*', help='real bom exports to benchmark; synthetic ones are generated if omitted')
+    parser.add_argument('--rows', type=int, default=500000, help='rows per synthetic export')
+    args = parser.parse_args()
+
+    if args.files:
+        for path in args.files:
+            bench_file(path, os.path.basename(path)[:24])
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, encoding, delimiter, headers in EXPORT_PROFILES:
+                path = os.path.join(tmp, label.replace(' ', '_') + '.csv')
+                generate_export(path, encoding, delimiter, headers, args.rows)
+                bench_file(path, label)
+
+    # ru_maxrss is kilobytes on linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\npeak rss: {peak_mb:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
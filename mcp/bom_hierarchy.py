@@ -0,0 +1,136 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+_NUMBER = re.compile(r'[-+]?\d*\.?\d+')
+# a comma before a group of exactly three digits, as in "1,000" or "12,500,000"
+_THOUSANDS = re.compile(r'(?<=\d),(?=\d{3}(?!\d))')
+_DOT_PREFIX = re.compile(r'^(\.+)\d*$')
+_OUTLINE = re.compile(r'^\d+(\.\d+)+$')
+
+
+class PurchaseLine(NamedTuple):
+    # one unique leaf part with its rolled-up quantity
+    name: str
+    quantity: float
+    occurrences: int
+
+
+class BOMNode:
+    __slots__ = ('name', 'quantity', 'level', 'item_id', 'parent_ref', 'children', 'total')
+
+    def __init__(self, name: str, quantity: float, level: Optional[int] = None,
+                 item_id: Optional[str] = None, parent_ref: Optional[str] = None):
+        self.name = name
+        self.quantity = quantity
+        self.level = level
+        self.item_id = item_id
+        self.parent_ref = parent_ref
+        self.children: List['BOMNode'] = []
+        self.total = quantity
+
+
+def parse_quantity(value: Optional[str]) -> float:
+    # leading number of the cell ("4", "2 pcs", "0.5 m", "1,000", "0,5 m"), defaulting to 1
+    if not value:
+        return 1.0
+    # thousands separators go first, any comma left is a decimal comma
+    match = _NUMBER.search(_THOUSANDS.sub('', value).replace(',', '.'))
+    return float(match.group()) if match else 1.0
+
+
+def is_outline_numbering(levels: Iterable[Optional[str]]) -> bool:
+    # "1", "1.1", "1.2.3" style level columns, where depth is the number of dots
+    return any(value and _OUTLINE.match(value.strip()) for value in levels)
+
+
+def parse_level(value: Optional[str], outline: bool = False) -> Optional[int]:
+    # understand "2", sap-style "..2" and, in outline mode, "1.2.3"
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    if outline:
+        return value.count('.') if value.replace('.', '').isdigit() else None
+    if value.isdigit():
+        return int(value)
+    dots = _DOT_PREFIX.match(value)
+    if dots:
+        return len(dots.group(1))
+    return None
+
+
+def build_tree_from_levels(nodes: List[BOMNode]) -> List[BOMNode]:
+    # attach each row to the nearest previous row with a smaller level (one stack pass)
+    roots: List[BOMNode] = []
+    stack: List[BOMNode] = []
+    for node in nodes:
+        if node.level is None:
+            node.level = 0
+        while stack and stack[-1].level >= node.level:
+            stack.pop()
+        if stack:
+            stack[-1].children.append(node)
+        else:
+            roots.append(node)
+        stack.append(node)
+    return roots
+
+
+def build_tree_from_parents(nodes: List[BOMNode]) -> List[BOMNode]:
+    # attach rows by parent reference, matching item ids or else part names
+    by_ref: Dict[str, BOMNode] = {}
+    for node in nodes:
+        by_ref.setdefault(node.item_id or node.name, node)
+
+    roots: List[BOMNode] = []
+    for node in nodes:
+        parent = by_ref.get(node.parent_ref) if node.parent_ref else None
+        if parent is None or parent is node:
+            roots.append(node)
+        else:
+            parent.children.append(node)
+    return roots
+
+
+def rollup(roots: List[BOMNode]) -> List[BOMNode]:
+    # multiply quantities down the tree and return the leaves, each node visited once
+    leaves: List[BOMNode] = []
+    visited = set()
+    stack = [(root, 1.0) for root in reversed(roots)]
+    while stack:
+        node, multiplier = stack.pop()
+        if id(node) in visited:
+            continue  # parent reference cycle
+        visited.add(id(node))
+        node.total = node.quantity * multiplier
+        if node.children:
+            stack.extend((child, node.total) for child in reversed(node.children))
+        else:
+            leaves.append(node)
+    return leaves
+
+
+def aggregate_leaves(leaves: Iterable[BOMNode]) -> List[PurchaseLine]:
+    # one purchase line per unique leaf part, in first-seen order
+    totals: Dict[str, List] = {}
+    for leaf in leaves:
+        if not leaf.name:
+            continue
+        entry = totals.setdefault(leaf.name, [0.0, 0])
+        entry[0] += leaf.total
+        entry[1] += 1
+    return [PurchaseLine(name, quantity, count) for name, (quantity, count) in totals.items()]
+
+
+def build_purchase_list(records: Iterable, by_level: bool) -> List[PurchaseLine]:
+    # records are bom_parser.PartRecord tuples; returns the aggregated leaf purchase list
+    records = list(records)
+    outline = by_level and is_outline_numbering(r.level for r in records)
+    nodes = [
+        BOMNode(r.name, parse_quantity(r.quantity), parse_level(r.level, outline), r.item_id or None, r.parent or None)
+        for r in records
+    ]
+    roots = build_tree_from_levels(nodes) if by_level else build_tree_from_parents(nodes)
+    return aggregate_leaves(rollup(roots))
@@ -0,0 +1,133 @@
+import codecs
+import csv
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+# header aliases in priority order, matched case and whitespace insensitively
+PART_NAME_ALIASES = ['part_name', 'Part Name', 'part', 'Part', 'description', 'Description', 'item', 'Item',
+                     'item name', 'part description', 'component', 'mpn', 'manufacturer part number',
+                     'value', 'comment', 'name']
+QUANTITY_ALIASES = ['quantity', 'qty', 'qty.', 'quantity per', 'qty per', 'count', 'amount']
+# multi-level bom structure columns
+LEVEL_ALIASES = ['level', 'lvl', 'bom level', 'indent level', 'depth']
+# not a bare "assembly", which often holds a build variant or dnp flag rather than a parent reference
+PARENT_ALIASES = ['parent', 'parent id', 'parent item', 'parent part', 'parent assembly']
+ITEM_ID_ALIASES = ['id', 'item id', 'item number', 'item no', 'find number', 'line id', 'pos', 'position']
+
+SNIFF_DELIMITERS = ',;\t|'
+SAMPLE_BYTES = 1024 * 1024
+# csv.Sniffer is slow on big samples, so it only sees the first few lines
+DIALECT_SAMPLE_CHARS = 64 * 1024
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize_header(name: str) -> str:
+    # "Part_Name ", "part name" and "PART-NAME" all become "part name"
+    return _NON_WORD.sub(' ', name).strip().casefold()
+
+
+def _alias_table(fields: Dict[str, List[str]]) -> Dict[str, Tuple[str, int]]:
+    # normalized alias -> (field, priority), built once at import
+    table = {}
+    for field, aliases in fields.items():
+        for priority, alias in enumerate(aliases):
+            table.setdefault(normalize_header(alias), (field, priority))
+    return table
+
+
+_COLUMN_ALIASES = _alias_table({
+    'part_name': PART_NAME_ALIASES,
+    'quantity': QUANTITY_ALIASES,
+    'level': LEVEL_ALIASES,
+    'parent': PARENT_ALIASES,
+    'item_id': ITEM_ID_ALIASES,
+})
+
+
+class ColumnMap(NamedTuple):
+    headers: List[str]
+    part_name: int
+    quantity: Optional[int]
+    level: Optional[int] = None
+    parent: Optional[int] = None
+    item_id: Optional[int] = None
+
+
+def resolve_columns(headers: List[str]) -> ColumnMap:
+    # find the part name, quantity and structure columns in a single pass over the header
+    best: Dict[str, Tuple[int, int]] = {}
+    for index, header in enumerate(headers):
+        match = _COLUMN_ALIASES.get(normalize_header(header or ''))
+        if match is None:
+            continue
+        field, priority = match
+        if field not in best or priority < best[field][0]:
+            best[field] = (priority, index)
+
+    # if no part name column matches, use the first column
+    part_name = best['part_name'][1] if 'part_name' in best else 0
+    found = {field: index for field, (_, index) in best.items() if field != 'part_name'}
+    return ColumnMap(headers, part_name, found.get('quantity'), found.get('level'),
+                     found.get('parent'), found.get('item_id'))
+
+
+def detect_encoding(raw: bytes) -> str:
+    # pick an encoding from a byte sample of the file
+    if raw.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if raw.startswith(codecs.BOM_UTF16_LE) or raw.startswith(codecs.BOM_UTF16_BE):
+        return 'utf-16'
+    try:
+        # final=False so a multibyte character cut off by the sample is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(raw, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        raw.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        # latin-1 decodes any byte sequence
+        return 'latin-1'
+
+
+def detect_dialect(sample: str):
+    # let csv.Sniffer work out the delimiter and quoting, defaulting to excel
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=SNIFF_DELIMITERS)
+    except csv.Error:
+        return csv.excel
+
+
+def sniff_file(path: str, sample_bytes: int = SAMPLE_BYTES):
+    # detect encoding and dialect from the start of the file
+    with open(path, 'rb') as file:
+        raw = file.read(sample_bytes)
+    encoding = detect_encoding(raw)
+    sample = raw.decode(encoding, errors='ignore')
+    # sniff on whole lines only so a truncated last row does not confuse it
+    if len(sample) > DIALECT_SAMPLE_CHARS and '\n' in sample[:DIALECT_SAMPLE_CHARS]:
+        sample = sample[:sample.rindex('\n', 0, DIALECT_SAMPLE_CHARS)]
+    return encoding, detect_dialect(sample)
+
+
+@contextmanager
+def open_bom(path: str) -> Iterator[Tuple[Iterator[List[str]], ColumnMap]]:
+    # open a bom export of unknown encoding/dialect as a csv.reader positioned after the header
+    encoding, dialect = sniff_file(path)
+    # the sample decides the encoding; replace stray bytes further in rather than fail mid-file
+    with open(path, 'r', encoding=encoding, errors='replace', newline='') as file:
+        reader = csv.reader(file, dialect)
+        headers = next(reader, None) or []
+        yield reader, resolve_columns([h.strip() for h in headers])
+
+
+@contextmanager
+def open_bom_dicts(path: str) -> Iterator[csv.DictReader]:
+    # same as open_bom but yields a DictReader keyed by the original headers
+    encoding, dialect = sniff_file(path)
+    with open(path, 'r', encoding=encoding, errors='replace', newline='') as file:
+        yield csv.DictReader(file, dialect=dialect)
@@ -1,36 +1,103 @@
-import csv
-from typing import List, Dict
+from typing import List, Dict, Iterator, NamedTuple, Optional
+from bom_ingest import open_bom, open_bom_dicts, resolve_columns
+from bom_hierarchy import PurchaseLine, build_purchase_list, parse_quantity
+
+
+class PartRecord(NamedTuple):
+    # one bom row reduced to what the pipeline needs
+    line: int
+    name: str
+    quantity: Optional[str] = None
+    # structure columns, only set for multi-level boms
+    level: Optional[str] = None
+    parent: Optional[str] = None
+    item_id: Optional[str] = None
+
+
+def resolve_part_column(headers: List[str]) -> int:
+    # index of the part name column, falling back to the first column
+    return resolve_columns(headers).part_name
+
+
+def _cell(row: List[str], index: Optional[int]) -> Optional[str]:
+    # stripped cell value, or None when the column is absent
+    if index is None or index >= len(row):
+        return None
+    return row[index].strip()
 
 
 class BOMParser:
     def __init__(self, csv_path: str):
         self.csv_path = csv_path
         self.parts = []
-        
+        self.columns = None
+
+    def iter_parts(self) -> Iterator[PartRecord]:
+        # stream part records straight from the file without keeping rows around
+        with open_bom(self.csv_path) as (reader, columns):
+            if not columns.headers:
+                return
+            # columns are resolved once from the header
+            self.columns = columns
+            for line, row in enumerate(reader, start=1):
+                if not row:
+                    continue
+                yield PartRecord(
+                    line,
+                    _cell(row, columns.part_name) or '',
+                    _cell(row, columns.quantity),
+                    _cell(row, columns.level),
+                    _cell(row, columns.parent),
+                    _cell(row, columns.item_id),
+                )
+
+    def iter_part_names(self, unique: bool = False) -> Iterator[str]:
+        # lazily yield part names, optionally skipping repeats
+        seen = set()
+        for record in self.iter_parts():
+            if unique:
+                if record.name in seen:
+                    continue
+                seen.add(record.name)
+            yield record.name
+
+    def get_columns(self):
+        # column map of the bom header, read without scanning the rows
+        if self.columns is None:
+            with open_bom(self.csv_path) as (_, columns):
+                self.columns = columns
+        return self.columns
+
+    def is_hierarchical(self) -> bool:
+        # multi-level boms carry a level column or parent references
+        columns = self.get_columns()
+        return columns.level is not None or columns.parent is not None
+
+    def get_purchase_list(self) -> List[PurchaseLine]:
+        # unique leaf parts with quantities multiplied down the assembly tree
+        return build_purchase_list(self.iter_parts(), by_level=self.get_columns().level is not None)
+
+    def get_quantities(self) -> Dict[str, float]:
+        # total quantity to buy per unique part name
+        if self.is_hierarchical():
+            return {line.name: line.quantity for line in self.get_purchase_list()}
+        totals: Dict[str, float] = {}
+        for record in self.iter_parts():
+            totals[record.name] = totals.get(record.name, 0.0) + parse_quantity(record.quantity)
+        return totals
+
     def parse_csv(self) -> List[Dict[str, str]]:
         # read the csv file and extract part information
-        with open(self.csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+        with open_bom_dicts(self.csv_path) as reader:
             self.parts = [row for row in reader]
         return self.parts
-    
+
     def get_parts(self) -> List[Dict[str, str]]:
         # return the parsed parts list
         if not self.parts:
             self.parse_csv()
         return self.parts
-    
+
     def get_part_names(self) -> List[str]:
         # extract just the part names from the bom
-        if not self.parts:
-            self.parse_csv()
-        # try common column names for part identification
-        possible_columns = ['part_name', 'Part Name', 'part', 'Part', 'description', 'Description', 'item', 'Item']
-        for col in possible_columns:
-            if col in self.parts[0]:
-                return [part[col] for part in self.parts]
-        # if no standard column found, use the first column
-        first_col = list(self.parts[0].keys())[0]
-        return [part[first_col] for part in self.parts]
-
-
+        return list(self.iter_part_names())
@@ -1,20 +1,74 @@
 import os
-import json
-from typing import Dict, List, Optional
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 from openai import OpenAI
 from playwright_mcp_bridge import PlaywrightMCPBridge
+from browser_pool import BrowserPool, current_pool
+from async_playwright_bridge import AsyncPlaywrightMCPBridge
+from politeness import PolitenessScheduler
+from browser_profiles import ProfileStore
+from resource_filter import ResourceFilter
+from search_cache import SearchCache, NegativeCache
+from circuit_breaker import CircuitBreaker
+from search_strategy import SearchStrategy, BEST_PRICE
+from llm_simulation import (LLMSimulator, SEARCH_SYSTEM_PROMPT, CART_SYSTEM_PROMPT, EMPTY_PRODUCT, CART_PARSE_FAILED,
+                            DEFAULT_BATCH_SIZE, search_prompt, cart_prompt, extract_json)
+from site_selectors import search_url
 
 
 class BrowserController:
     def __init__(self, api_key: str = None, mcp_server_url: str = None, 
                  model_name: str = None, base_url: str = None, use_open_source: bool = False,
-                 use_real_browser: bool = True, headless: bool = False):
+                 use_real_browser: bool = True, headless: bool = False, session_scoped: bool = False,
+                 workers: int = 1, scheduler: PolitenessScheduler = None, profiles: ProfileStore = None,
+                 resource_filter: ResourceFilter = None, search_cache: SearchCache = None,
+                 negative_cache: NegativeCache = None,
+                 llm_concurrency: int = None, llm_batch_size: int = None,
+                 breaker: CircuitBreaker = None, strategy: SearchStrategy = None, pacing: str = None):
         self.mcp_server_url = mcp_server_url or os.getenv('MCP_SERVER_URL', 'http://localhost:3000')
         self.use_open_source = use_open_source or os.getenv('USE_OPEN_SOURCE_MODEL', 'false').lower() == 'true'
         
         # browser automation settings
         self.use_real_browser = use_real_browser
         self.headless = headless
+        # pacing profile name for every browser we launch (see wait_strategy)
+        self.pacing = pacing
+        
+        # session mode: one long-lived browser for the whole run, one context per site
+        self.session_scoped = session_scoped
+        self.profiles = profiles
+        self.resource_filter = resource_filter
+        # persisted (site, part) -> product results from earlier real-browser searches
+        self.search_cache = search_cache
+        # (site, part) pairs that recently came back empty and are skipped
+        self.negative_cache = negative_cache
+        # per-domain circuit breaker so a broken site fails fast
+        self.breaker = breaker
+        # when to stop searching a part's remaining websites (None searches them all)
+        self.strategy = strategy or SearchStrategy()
+        self.session = None
+        self.browser_launches = 0
+        self.homepage_loads = 0
+        self.homepage_loads_skipped = 0
+        self.direct_searches = 0
+        self.stats_lock = threading.Lock()
+        
+        # parallel mode: parts are spread over a pool of persistent browsers
+        self.workers = max(1, workers)
+        self.pool = BrowserPool(self.workers, headless=headless, profiles=profiles,
+                                resource_filter=resource_filter, pacing=pacing) if use_real_browser and self.workers > 1 else None
+        
+        # optional per-domain pacing shared by every worker
+        self.scheduler = scheduler
+        
+        # async llm simulation settings, the simulator is created on first use
+        self.llm_concurrency = llm_concurrency
+        self.llm_batch_size = llm_batch_size
+        self.simulator = None
         
         # configure for open source or openai
         if self.use_open_source:
@@ -37,76 +91,160 @@ class BrowserController:
     def search_part_on_website(self, part_name: str, website_url: str) -> Dict[str, Optional[str]]:
         # use real browser automation with playwright
         if self.use_real_browser:
-            return self._search_with_playwright(part_name, website_url)
+            if self.negative_cache is not None and self.negative_cache.is_known_miss(website_url, part_name):
+                print(f"  skipping, {website_url} had no result for {part_name} recently")
+                return {'product_name': None, 'price': None, 'product_url': None}
+            if self.search_cache is not None:
+                cached = self.search_cache.get(website_url, part_name)
+                if cached is not None:
+                    print(f"  cache hit: {cached['product_name']} - {cached['price']}")
+                    return cached
+            if self.breaker is not None and not self.breaker.allow(website_url):
+                print(f"  skipping {website_url}, circuit open after repeated failures")
+                return {'product_name': None, 'price': None, 'product_url': None}
+            product_info = self._search_with_playwright(part_name, website_url)
+            if self.search_cache is not None:
+                self.search_cache.put(website_url, part_name, product_info)
+            return product_info
         else:
             # fallback to llm-based simulation
             return self._search_with_llm(part_name, website_url)
     
+    def _count(self, stat: str):
+        # counters are shared by pool workers
+        with self.stats_lock:
+            setattr(self, stat, getattr(self, stat) + 1)
+    
+    def _launch_browser(self, url: str = None) -> PlaywrightMCPBridge:
+        browser = PlaywrightMCPBridge(headless=self.headless, profiles=self.profiles,
+                                      resource_filter=self.resource_filter, pacing=self.pacing)
+        browser.start(url)
+        self._count('browser_launches')
+        return browser
+    
+    @contextmanager
+    def _browser_for(self, url: str):
+        # yield a browser ready to work on url's site
+        pool = current_pool() or self.pool
+        if pool is not None:
+            # pool mode: lease this worker's context for the site
+            with pool.lease(url) as browser:
+                yield browser
+            return
+        
+        if not self.session_scoped:
+            # fresh browser per call, closed afterwards
+            browser = None
+            try:
+                # start in the site's context so its profile and resource filter overrides apply;
+                # close() saves the profile back
+                browser = self._launch_browser(url)
+                browser.use_site(url)
+                yield browser
+            finally:
+                if browser:
+                    browser.close()
+            return
+        
+        # session mode: reuse the long-lived browser, relaunching it if it crashed
+        if self.session is None or not self.session.is_alive():
+            if self.session is not None:
+                print(f"  browser session lost, relaunching...")
+                self.session.close()
+            self.session = self._launch_browser(url)
+        self.session.use_site(url)
+        yield self.session
+    
+    def _record_site(self, url: str, success: bool, started: float):
+        # feed the outcome of a site call to its circuit breaker
+        if self.breaker is not None:
+            self.breaker.record(url, success, time.monotonic() - started)
+    
+    @contextmanager
+    def _polite(self, url: str):
+        # wait for the domain's rate and concurrency limits before touching the site
+        if self.scheduler is None:
+            yield
+            return
+        with self.scheduler.slot(url):
+            yield
+    
+    def close(self):
+        # close the session browser or pool once at the end of the run
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+        if self.pool is not None:
+            self.browser_launches += self.pool.launches
+            self.pool.close()
+    
     def _search_with_playwright(self, part_name: str, website_url: str) -> Dict[str, Optional[str]]:
         # use playwright to actually control a browser
-        browser = PlaywrightMCPBridge(headless=self.headless)
-        
+        started = time.monotonic()
         try:
-            browser.start()
-            
-            # navigate to website
-            if not browser.navigate(website_url):
-                return {'product_name': None, 'price': None, 'product_url': None}
-            
-            # search for the part
-            if not browser.search_product(part_name):
-                print(f"  could not search on {website_url}")
-                return {'product_name': None, 'price': None, 'product_url': None}
-            
-            # extract product information
-            product_info = browser.extract_product_info()
-            
-            return product_info
+            with self._polite(website_url), self._browser_for(website_url) as browser:
+                # time the site itself, not the politeness wait
+                started = time.monotonic()
+                if search_url(website_url, part_name):
+                    # known site: load the results page directly instead of the homepage
+                    self._count('direct_searches')
+                    self._count('homepage_loads_skipped')
+                    searched = browser.search_product(part_name, site_url=website_url)
+                    on_site = True
+                else:
+                    # a session already on this site can search from the current page
+                    on_site = browser.is_on_site(website_url)
+                    if on_site:
+                        self._count('homepage_loads_skipped')
+                    else:
+                        self._count('homepage_loads')
+                        # navigate to website
+                        if not browser.navigate(website_url):
+                            self._record_site(website_url, False, started)
+                            return {'product_name': None, 'price': None, 'product_url': None}
+                    
+                    # search for the part
+                    searched = browser.search_product(part_name)
+                if not searched and on_site:
+                    # fall back to the search form, starting again from the homepage
+                    self._count('homepage_loads')
+                    searched = browser.navigate(website_url) and browser.search_product(part_name, direct=False)
+                if not searched:
+                    print(f"  could not search on {website_url}")
+                    self._record_site(website_url, False, started)
+                    return {'product_name': None, 'price': None, 'product_url': None}
+                
+                # extract product information
+                product_info = browser.extract_product_info()
+                # an empty result page still means the site works
+                self._record_site(website_url, True, started)
+                if browser.results_empty and self.negative_cache is not None:
+                    # the results page loaded and had nothing, remember that for a while;
+                    # challenge pages and extraction errors are not misses
+                    self.negative_cache.put(website_url, part_name, time.monotonic() - started)
+                
+                return product_info
             
         except Exception as e:
             print(f"  playwright error: {e}")
+            self._record_site(website_url, False, started)
             return {'product_name': None, 'price': None, 'product_url': None}
-        finally:
-            browser.close()
     
     def _search_with_llm(self, part_name: str, website_url: str) -> Dict[str, Optional[str]]:
         # use llm to simulate browser automation (original implementation)
-        prompt = f"""Using browser automation through MCP protocol:
-        1. Navigate to {website_url}
-        2. Search for the part: {part_name}
-        3. Find the first matching product result
-        4. Extract the product price and product URL
-        5. Return the information in JSON format: {{"price": "XX.XX", "product_url": "https://...", "product_name": "..."}}
-        
-        If the part is not found, return {{"price": null, "product_url": null, "product_name": null}}
-        """
-        
         try:
             # use llm to interact with mcp browser automation
             response = self.client.chat.completions.create(
                 model=self.model_name,
                 messages=[
-                    {"role": "system", "content": "You are a browser automation assistant using MCP protocol. Extract product information and return it in JSON format only."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": SEARCH_SYSTEM_PROMPT},
+                    {"role": "user", "content": search_prompt(part_name, website_url)}
                 ],
                 temperature=0.3
             )
             
             # parse the response to extract product info
-            response_text = response.choices[0].message.content
-            # try to extract json from the response
-            try:
-                # find json in the response
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    product_info = json.loads(response_text[json_start:json_end])
-                else:
-                    product_info = {"price": None, "product_url": None, "product_name": None}
-            except:
-                product_info = {"price": None, "product_url": None, "product_name": None}
-                
-            return product_info
+            return extract_json(response.choices[0].message.content, EMPTY_PRODUCT)
             
         except Exception as e:
             print(f"error searching for {part_name} on {website_url}: {e}")
@@ -115,70 +253,121 @@ class BrowserController:
     def add_to_cart(self, product_url: str) -> Dict[str, any]:
         # add product to cart using real browser or llm
         if self.use_real_browser:
+            if self.breaker is not None and not self.breaker.allow(product_url):
+                print(f"  skipping cart add, circuit open for {product_url}")
+                return {'success': False, 'cart_url': None, 'message': 'Site circuit open after repeated failures'}
             return self._add_to_cart_with_playwright(product_url)
         else:
             return self._add_to_cart_with_llm(product_url)
     
     def _add_to_cart_with_playwright(self, product_url: str) -> Dict[str, any]:
         # use playwright to actually add to cart
-        browser = PlaywrightMCPBridge(headless=self.headless)
-        
+        # in session mode this shares the search's context, so the cart accumulates
+        started = time.monotonic()
         try:
-            browser.start()
-            result = browser.add_to_cart(product_url)
-            return result
+            with self._polite(product_url), self._browser_for(product_url) as browser:
+                started = time.monotonic()
+                result = browser.add_to_cart(product_url)
+                self._record_site(product_url, True, started)
+                return result
         except Exception as e:
             print(f"  playwright error adding to cart: {e}")
+            self._record_site(product_url, False, started)
             return {'success': False, 'cart_url': None, 'message': str(e)}
-        finally:
-            browser.close()
     
     def _add_to_cart_with_llm(self, product_url: str) -> Dict[str, any]:
         # use llm to simulate adding to cart (original implementation)
-        prompt = f"""Using browser automation through MCP protocol:
-        1. Navigate to {product_url}
-        2. Find and click the "Add to Cart" or "Add to Basket" button
-        3. Wait for confirmation that the item was added
-        4. Get the current cart URL
-        5. Return the result in JSON format: {{"success": true/false, "cart_url": "https://...", "message": "..."}}
-        """
-        
         try:
             response = self.client.chat.completions.create(
                 model=self.model_name,
                 messages=[
-                    {"role": "system", "content": "You are a browser automation assistant using MCP protocol. Perform actions and return results in JSON format only."},
-                    {"role": "user", "content": prompt}
+                    {"role": "system", "content": CART_SYSTEM_PROMPT},
+                    {"role": "user", "content": cart_prompt(product_url)}
                 ],
                 temperature=0.3
             )
             
-            response_text = response.choices[0].message.content
-            # try to extract json from the response
-            try:
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    result = json.loads(response_text[json_start:json_end])
-                else:
-                    result = {"success": False, "cart_url": None, "message": "Failed to parse response"}
-            except:
-                result = {"success": False, "cart_url": None, "message": "Failed to parse response"}
-                
-            return result
+            return extract_json(response.choices[0].message.content, CART_PARSE_FAILED)
             
         except Exception as e:
             print(f"error adding {product_url} to cart: {e}")
             return {"success": False, "cart_url": None, "message": str(e)}
     
-    def process_part_across_websites(self, part_name: str, websites: List[str]) -> List[Dict]:
+    def build_cart(self, items: List[Tuple[str, int]]) -> Dict:
+        # add every (product_url, quantity) from one supplier in a single browser session
+        # and return that supplier's cart url with per-item success flags
+        if not self.use_real_browser:
+            results = [self._add_to_cart_with_llm(product_url) for product_url, _ in items]
+            cart_url = next((r.get('cart_url') for r in results if r.get('cart_url')), None)
+            return {'cart_url': cart_url, 'added': [r.get('success', False) for r in results]}
+        
+        added = []
+        cart_url = None
+        supplier_url = items[0][0]
+        if self.breaker is not None and not self.breaker.allow(supplier_url):
+            print(f"  skipping cart for {supplier_url}, circuit open after repeated failures")
+            return {'cart_url': None, 'added': [False] * len(items)}
+        started = time.monotonic()
+        try:
+            with self._browser_for(supplier_url) as browser:
+                for product_url, quantity in items:
+                    with self._polite(product_url):
+                        added.append(browser.add_to_cart(product_url, quantity=quantity).get('success', False))
+                cart_url = browser.get_cart_url()
+            if self.breaker is not None:
+                # a session where nothing could be added is a failure, even if nothing raised;
+                # judge its latency per item, not in total
+                self.breaker.record(supplier_url, any(added), (time.monotonic() - started) / len(items))
+        except Exception as e:
+            print(f"  playwright error building cart: {e}")
+            self._record_site(supplier_url, False, started)
+        added += [False] * (len(items) - len(added))
+        return {'cart_url': cart_url, 'added': added}
+    
+    def _finish_with_strategy(self, part_name: str, websites: List[str], results: List[Dict]) -> Optional[Dict]:
+        # mark the product the strategy picked; only that one goes into a cart
+        self.strategy.record(len(websites), len(results))
+        chosen = self.strategy.choose(part_name, results)
+        for info in results:
+            info['selected'] = info is chosen
+        if chosen is None:
+            print(f"  no acceptable match for {part_name}")
+        return chosen
+    
+    def _process_part_with_strategy(self, part_name: str, websites: List[str], add_to_cart: bool) -> List[Dict]:
+        # search websites in order until the strategy is satisfied, skipping the rest
+        started = time.monotonic()
+        results = []
+        for website in websites:
+            print(f"  searching {part_name} on {website}")
+            product_info = self.search_part_on_website(part_name, website)
+            product_info['website'] = website
+            product_info['cart_url'] = None
+            product_info['added_to_cart'] = False
+            results.append(product_info)
+            if self.strategy.is_satisfied(part_name, results, started):
+                remaining = len(websites) - len(results)
+                if remaining:
+                    print(f"  {self.strategy.name} strategy satisfied, skipping {remaining} remaining site(s)")
+                break
+        
+        chosen = self._finish_with_strategy(part_name, websites, results)
+        if chosen is not None and add_to_cart:
+            cart_result = self.add_to_cart(chosen['product_url'])
+            chosen['cart_url'] = cart_result.get('cart_url')
+            chosen['added_to_cart'] = cart_result.get('success', False)
+        return results
+    
+    def process_part_across_websites(self, part_name: str, websites: List[str], add_to_cart: bool = True) -> List[Dict]:
         # search for a part across multiple websites and collect results
+        if not self.strategy.exhaustive:
+            return self._process_part_with_strategy(part_name, websites, add_to_cart)
         results = []
         for website in websites:
             print(f"  searching {part_name} on {website}")
             product_info = self.search_part_on_website(part_name, website)
             
-            if product_info['product_url']:
+            if product_info['product_url'] and add_to_cart:
                 # if we found the product, try to add it to cart
                 cart_result = self.add_to_cart(product_info['product_url'])
                 product_info['cart_url'] = cart_result.get('cart_url')
@@ -189,6 +378,245 @@ class BrowserController:
             
             product_info['website'] = website
             results.append(product_info)
-            
+        
+        if not add_to_cart:
+            # the cart builder buys one product per part, the one the strategy picks
+            self._finish_with_strategy(part_name, websites, results)
         return results
-
+    
+    def process_parts(self, websites_map: Dict[str, List[str]], add_to_cart: bool = True) -> Dict[str, List[Dict]]:
+        # process every part, spreading parts over the workers when there are several
+        # add_to_cart=False only searches, leaving carts to the per-supplier cart builder
+        items = list(websites_map.items())
+        
+        def process(item):
+            part_name, websites = item
+            print(f"\nprocessing: {part_name}")
+            if not websites:
+                print(f"  no websites found for {part_name}")
+                return []
+            return self.process_part_across_websites(part_name, websites, add_to_cart)
+        
+        if self.pool is not None:
+            results = self.pool.map(process, items)
+        elif self.workers > 1:
+            # llm simulation (search-only --supplier-carts runs) has no browser to pin, plain threads are enough
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                results = list(executor.map(process, items))
+        else:
+            results = [process(item) for item in items]
+        
+        return {part_name: result for (part_name, _), result in zip(items, results)}
+    
+    async def _acquire_async(self, website: str):
+        # wait for the domain's politeness slot off the event loop (the wait blocks); if this task
+        # is cancelled meanwhile, whichever side finishes second hands the slot back
+        handoff = threading.Lock()
+        state = {'granted': False, 'abandoned': False}
+        
+        def acquire():
+            self.scheduler.acquire(website)
+            with handoff:
+                if state['abandoned']:
+                    self.scheduler.release(website)
+                else:
+                    state['granted'] = True
+        
+        try:
+            await asyncio.to_thread(acquire)
+        except asyncio.CancelledError:
+            with handoff:
+                state['abandoned'] = True
+                if state['granted']:
+                    self.scheduler.release(website)
+            raise
+    
+    async def _search_and_cart_async(self, root: AsyncPlaywrightMCPBridge, part_name: str, website: str,
+                                     add_to_cart: bool = True) -> Dict:
+        # search one website in its own tab, then add the product to the site's kept cart tab
+        if self.negative_cache is not None and self.negative_cache.is_known_miss(website, part_name):
+            print(f"  skipping, {website} had no result for {part_name} recently")
+            return {'product_name': None, 'price': None, 'product_url': None,
+                    'cart_url': None, 'added_to_cart': False, 'website': website}
+        # cache hits need neither the domain's politeness slot nor a browser context
+        product_info = self.search_cache.get(website, part_name) if self.search_cache is not None else None
+        if product_info is not None:
+            print(f"  cache hit: {product_info['product_name']} - {product_info['price']}")
+        else:
+            product_info = await self._search_async(root, part_name, website)
+        
+        if product_info.get('product_url') and add_to_cart:
+            # the search tab's context is gone, the cart goes in the site's kept cart tab
+            cart_result = await self._add_to_cart_async(root, website, product_info['product_url'])
+            product_info['cart_url'] = cart_result.get('cart_url')
+            product_info['added_to_cart'] = cart_result.get('success', False)
+        else:
+            product_info['cart_url'] = None
+            product_info['added_to_cart'] = False
+        product_info['website'] = website
+        return product_info
+    
+    async def _search_async(self, root: AsyncPlaywrightMCPBridge, part_name: str, website: str) -> Dict:
+        # live search in a temporary tab, behind the domain's politeness slot and circuit breaker
+        empty = {'product_name': None, 'price': None, 'product_url': None}
+        acquired = False
+        started = time.monotonic()
+        in_call = False
+        tab = None
+        try:
+            if self.scheduler is not None:
+                await self._acquire_async(website)
+                acquired = True
+            if self.breaker is not None and not self.breaker.allow(website):
+                print(f"  skipping {website}, circuit open after repeated failures")
+                return dict(empty)
+            started = time.monotonic()
+            in_call = True
+            tab = await root.fork(website)
+            print(f"  searching {part_name} on {website}")
+            product_info = empty
+            if search_url(website, part_name):
+                # known site: one navigation straight to the results page
+                searched = await tab.search_product(part_name, site_url=website)
+            else:
+                searched = await tab.navigate(website) and await tab.search_product(part_name)
+            if searched:
+                product_info = await tab.extract_product_info()
+                if tab.results_empty and self.negative_cache is not None:
+                    self.negative_cache.put(website, part_name, time.monotonic() - started)
+            self._record_site(website, searched, started)
+            in_call = False
+            if self.search_cache is not None:
+                self.search_cache.put(website, part_name, product_info)
+            return product_info
+        except asyncio.CancelledError:
+            # an early-exit strategy no longer needs this search; a cancelled probe is no verdict
+            if in_call and self.breaker is not None:
+                self.breaker.cancel(website)
+            raise
+        except Exception as e:
+            print(f"  playwright error on {website}: {e}")
+            if in_call:
+                self._record_site(website, False, started)
+            return dict(empty)
+        finally:
+            if tab is not None:
+                await tab.close()
+            if acquired:
+                self.scheduler.release(website)
+    
+    async def _add_to_cart_async(self, root: AsyncPlaywrightMCPBridge, website: str, product_url: str) -> Dict:
+        # add a product to the site's kept cart tab, behind the same politeness and breaker checks as a search
+        acquired = False
+        started = time.monotonic()
+        try:
+            if self.scheduler is not None:
+                await self._acquire_async(website)
+                acquired = True
+            if self.breaker is not None and not self.breaker.allow(website):
+                print(f"  skipping cart on {website}, circuit open after repeated failures")
+                return {'success': False, 'cart_url': None}
+            started = time.monotonic()
+            async with root.cart_lock(website):
+                tab = await root.cart_tab(website)
+                result = await tab.add_to_cart(product_url)
+            self._record_site(website, True, started)
+            return result
+        except Exception as e:
+            print(f"  playwright error adding to cart on {website}: {e}")
+            self._record_site(website, False, started)
+            return {'success': False, 'cart_url': None, 'message': str(e)}
+        finally:
+            if acquired:
+                self.scheduler.release(website)
+    
+    async def process_part_across_websites_async(self, part_name: str, websites: List[str],
+                                                 root: AsyncPlaywrightMCPBridge = None) -> List[Dict]:
+        # search all of a part's websites at the same time, one tab per website
+        if not self.use_real_browser:
+            # llm simulation is blocking, run it off the event loop
+            return await asyncio.to_thread(self.process_part_across_websites, part_name, websites)
+        
+        owns_root = root is None
+        if owns_root:
+            root = AsyncPlaywrightMCPBridge(headless=self.headless, resource_filter=self.resource_filter,
+                                            pacing=self.pacing, profiles=self.profiles)
+            await root.start()
+            self._count('browser_launches')
+        try:
+            if self.strategy.exhaustive:
+                return list(await asyncio.gather(
+                    *(self._search_and_cart_async(root, part_name, website) for website in websites)
+                ))
+            return await self._process_part_with_strategy_async(root, part_name, websites)
+        finally:
+            if owns_root:
+                await root.close()
+    
+    async def _process_part_with_strategy_async(self, root: AsyncPlaywrightMCPBridge, part_name: str,
+                                                websites: List[str]) -> List[Dict]:
+        # search every website at once, cancel the searches still running once the strategy
+        # is satisfied, then add only the chosen product to a cart
+        started = time.monotonic()
+        tasks = [asyncio.create_task(self._search_and_cart_async(root, part_name, website, add_to_cart=False))
+                 for website in websites]
+        pending = set(tasks)
+        done_results = {}
+        while pending:
+            timeout = None
+            if self.strategy.name == BEST_PRICE:
+                timeout = max(0.0, self.strategy.time_budget - (time.monotonic() - started))
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                done_results[task] = task.result()
+            ordered = [done_results[task] for task in tasks if task in done_results]
+            if not done or self.strategy.is_satisfied(part_name, ordered, started):
+                break
+        
+        if pending:
+            print(f"  {self.strategy.name} strategy satisfied, cancelling {len(pending)} pending search(es)")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        results = [done_results[task] for task in tasks if task in done_results]
+        chosen = self._finish_with_strategy(part_name, websites, results)
+        if chosen is not None:
+            cart_result = await self._add_to_cart_async(root, chosen['website'], chosen['product_url'])
+            chosen['cart_url'] = cart_result.get('cart_url')
+            chosen['added_to_cart'] = cart_result.get('success', False)
+        return results
+    
+    async def simulate_parts_async(self, websites_map: Dict[str, List[str]]) -> Dict[str, List[Dict]]:
+        # llm simulation of the whole bom with concurrent requests; local open source servers
+        # get batched requests since their per-request overhead dominates
+        if self.simulator is None:
+            batch_size = self.llm_batch_size if self.llm_batch_size is not None else (
+                DEFAULT_BATCH_SIZE if self.use_open_source else 1)
+            self.simulator = LLMSimulator(self.api_key, self.model_name, self.base_url,
+                                          max_concurrency=self.llm_concurrency, batch_size=batch_size)
+        return await self.simulator.run(websites_map)
+    
+    async def process_parts_async(self, websites_map: Dict[str, List[str]]) -> Dict[str, List[Dict]]:
+        # one async browser for the run; each part's websites are searched concurrently
+        if not self.use_real_browser:
+            return await self.simulate_parts_async(websites_map)
+        root = None
+        if self.use_real_browser:
+            root = AsyncPlaywrightMCPBridge(headless=self.headless, resource_filter=self.resource_filter,
+                                            pacing=self.pacing, profiles=self.profiles)
+            await root.start()
+            self._count('browser_launches')
+        try:
+            results = {}
+            for part_name, websites in websites_map.items():
+                print(f"\nprocessing: {part_name}")
+                if not websites:
+                    print(f"  no websites found for {part_name}")
+                    results[part_name] = []
+                    continue
+                results[part_name] = await self.process_part_across_websites_async(part_name, websites, root)
+            return results
+        finally:
+            if root is not None:
+                await root.close()
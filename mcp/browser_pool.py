@@ -0,0 +1,120 @@
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Iterable, List
+from playwright_mcp_bridge import PlaywrightMCPBridge
+from browser_profiles import ProfileStore
+from resource_filter import ResourceFilter
+
+
+# which pool, if any, owns the current thread
+_thread_state = threading.local()
+
+
+def current_pool():
+    # the BrowserPool whose worker is running this code, or None
+    return getattr(_thread_state, 'pool', None)
+
+
+class BrowserPool:
+    # n persistent browsers, each owned by one worker thread
+    # sync playwright objects may only be used from the thread that created them, so
+    # every worker keeps its own chromium and leases per-site contexts from it
+    def __init__(self, size: int = 2, headless: bool = False, name: str = 'browser', profiles: ProfileStore = None,
+                 resource_filter: ResourceFilter = None, pacing: str = None):
+        self.size = max(1, size)
+        self.headless = headless
+        self.profiles = profiles
+        self.resource_filter = resource_filter
+        self.pacing = pacing
+        self.name = name
+        self.tasks = queue.Queue()
+        self.workers: List[threading.Thread] = []
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+        self.launches = 0
+        self.relaunches = 0
+        self.leases = 0
+
+    def _ensure_workers(self):
+        # start the worker threads on first use
+        with self.lock:
+            if self.workers:
+                return
+            for i in range(self.size):
+                worker = threading.Thread(target=self._worker_loop, name=f'{self.name}-{i}', daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def _worker_loop(self):
+        _thread_state.pool = self
+        self.local.in_worker = True
+        self.local.browser = None
+        try:
+            while True:
+                task = self.tasks.get()
+                if task is None:
+                    break
+                fn, item, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(item))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            # the browser has to be closed by the thread that launched it
+            if self.local.browser is not None:
+                self.local.browser.close()
+
+    def submit(self, fn: Callable, item) -> Future:
+        # run fn(item) on the next free browser worker
+        self._ensure_workers()
+        future = Future()
+        self.tasks.put((fn, item, future))
+        return future
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        # run fn over items across the pool and return results in input order
+        futures = [self.submit(fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def _healthy_browser(self, url: str = None) -> PlaywrightMCPBridge:
+        # this worker's browser, relaunched if it crashed or was never started;
+        # a new browser's first context is url's site context, with its profile and filter overrides
+        browser = self.local.browser
+        if browser is not None and browser.is_alive():
+            return browser
+        if browser is not None:
+            print(f"  [{threading.current_thread().name}] browser crashed, relaunching...")
+            browser.close()
+            with self.lock:
+                self.relaunches += 1
+        browser = PlaywrightMCPBridge(headless=self.headless, profiles=self.profiles,
+                                      resource_filter=self.resource_filter, pacing=self.pacing)
+        browser.start(url)
+        self.local.browser = browser
+        with self.lock:
+            self.launches += 1
+        return browser
+
+    @contextmanager
+    def lease(self, url: str):
+        # lease this worker's context for url's site; returned when the block exits
+        if not getattr(self.local, 'in_worker', False):
+            raise RuntimeError('browser leases are only available inside pool tasks')
+        browser = self._healthy_browser(url)
+        browser.use_site(url)
+        with self.lock:
+            self.leases += 1
+        yield browser
+
+    def close(self):
+        # stop the workers; each one closes its own browser on the way out
+        for _ in self.workers:
+            self.tasks.put(None)
+        for worker in self.workers:
+            worker.join()
+        self.workers = []
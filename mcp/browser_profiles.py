@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+from typing import Optional
+from url_utils import registrable_domain
+
+
+DEFAULT_PROFILE_DIR = os.getenv('BROWSER_PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.browser_profiles'))
+
+
+class ProfileStore:
+    # one saved playwright storage_state (cookies + local storage) per supplier domain,
+    # so consent banners, region settings and sign-ins survive between runs
+    def __init__(self, directory: str = None):
+        self.directory = directory or DEFAULT_PROFILE_DIR
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        self.loaded = 0
+        self.saved = 0
+
+    def path_for(self, url: str) -> str:
+        return os.path.join(self.directory, f"{registrable_domain(url)}.json")
+
+    def state_for(self, url: str) -> Optional[str]:
+        # saved state file for url's site, or None on a cold run
+        path = self.path_for(url)
+        if not os.path.exists(path):
+            return None
+        self.loaded += 1
+        return path
+
+    def save(self, url: str, context) -> bool:
+        # write the context's state atomically; several workers may save the same site
+        path = self.path_for(url)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            os.close(fd)
+            context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+            self.saved += 1
+            return True
+        except Exception as e:
+            print(f"  could not save browser profile for {registrable_domain(url)}: {e}")
+            return False
+
+    async def save_async(self, url: str, context) -> bool:
+        # save() for async playwright contexts
+        path = self.path_for(url)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            os.close(fd)
+            await context.storage_state(path=tmp_path)
+            os.replace(tmp_path, path)
+            self.saved += 1
+            return True
+        except Exception as e:
+            print(f"  could not save browser profile for {registrable_domain(url)}: {e}")
+            return False
+
+    def reset(self):
+        # forget every saved profile
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        print(f"  cleared browser profiles in {self.directory}")
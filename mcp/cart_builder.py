@@ -0,0 +1,63 @@
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from url_utils import registrable_domain
+
+
+class SupplierCart(NamedTuple):
+    supplier: str            # registrable domain
+    cart_url: Optional[str]
+    parts: List[str]         # parts that were sent to this supplier's cart
+    added: int               # how many of them made it into the cart
+
+
+def group_by_supplier(results: Dict[str, List[Dict]]) -> Dict[str, List[Tuple[str, Dict]]]:
+    # found products per supplier as (part name, result) pairs, in bom order
+    groups: Dict[str, List[Tuple[str, Dict]]] = {}
+    for part_name, infos in results.items():
+        for info in infos:
+            # only the product the search strategy picked for the part is bought
+            if info.get('product_url') and info.get('selected', False):
+                groups.setdefault(registrable_domain(info['website']), []).append((part_name, info))
+    return groups
+
+
+def order_quantity(quantity: Optional[float]) -> int:
+    # carts take whole units; 2.5 m of wire is 3
+    return max(1, math.ceil(quantity)) if quantity else 1
+
+
+class CartBuilder:
+    # fills one cart per supplier with every product found there, in a single session
+    def __init__(self, controller, quantities: Dict[str, float] = None):
+        self.controller = controller
+        self.quantities = quantities or {}
+        self.carts: Dict[str, SupplierCart] = {}
+
+    def _build_one(self, supplier_items: Tuple[str, List[Tuple[str, Dict]]]) -> SupplierCart:
+        supplier, items = supplier_items
+        print(f"\nbuilding {supplier} cart ({len(items)} items)")
+        cart = self.controller.build_cart([
+            (info['product_url'], order_quantity(self.quantities.get(part_name))) for part_name, info in items
+        ])
+        for (_, info), added in zip(items, cart['added']):
+            info['added_to_cart'] = added
+            info['cart_url'] = cart['cart_url'] if added else None
+        return SupplierCart(supplier, cart['cart_url'], [part_name for part_name, _ in items], sum(cart['added']))
+
+    def build(self, results: Dict[str, List[Dict]]) -> Dict[str, SupplierCart]:
+        # updates cart_url/added_to_cart on the results in place and returns the carts by supplier
+        groups = list(group_by_supplier(results).items())
+        if self.controller.pool is not None:
+            # suppliers are independent, give each one a pool browser
+            carts = self.controller.pool.map(self._build_one, groups)
+        else:
+            carts = [self._build_one(group) for group in groups]
+        self.carts = {cart.supplier: cart for cart in carts}
+        return self.carts
+
+    def print_report(self):
+        if not self.carts:
+            return
+        print("supplier carts:")
+        for cart in self.carts.values():
+            print(f"  {cart.supplier:<20} {cart.added}/{len(cart.parts)} items  {cart.cart_url or '(no cart url)'}")
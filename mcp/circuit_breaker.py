@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+from typing import Dict
+from url_utils import registrable_domain
+
+
+CLOSED = 'closed'        # site is healthy, calls go through
+OPEN = 'open'            # site keeps failing, calls fail fast until the cooldown ends
+HALF_OPEN = 'half-open'  # cooldown over, one probe call decides whether to close or reopen
+
+DEFAULT_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURES', '3'))
+DEFAULT_SLOW_SECONDS = float(os.getenv('BREAKER_SLOW_SECONDS', '45'))
+DEFAULT_COOLDOWN_SECONDS = float(os.getenv('BREAKER_COOLDOWN_SECONDS', '120'))
+
+
+class _DomainCircuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+        self.fast_failures = 0
+        self.seconds_saved = 0.0
+        self.avg_failure_seconds = 0.0
+
+
+class CircuitBreaker:
+    # per-domain breaker: consecutive failures (slow calls count as failures) open it,
+    # then after a cooldown a single probe call is let through
+    def __init__(self, failure_threshold: int = None, slow_seconds: float = None, cooldown_seconds: float = None):
+        self.failure_threshold = max(1, failure_threshold or DEFAULT_FAILURE_THRESHOLD)
+        self.slow_seconds = slow_seconds or DEFAULT_SLOW_SECONDS
+        self.cooldown_seconds = DEFAULT_COOLDOWN_SECONDS if cooldown_seconds is None else cooldown_seconds
+        self.circuits: Dict[str, _DomainCircuit] = {}
+        self.lock = threading.Lock()
+
+    def _circuit(self, url: str) -> _DomainCircuit:
+        return self.circuits.setdefault(registrable_domain(url), _DomainCircuit())
+
+    def allow(self, url: str) -> bool:
+        # False means fail fast without touching the site
+        with self.lock:
+            circuit = self._circuit(url)
+            if circuit.state == OPEN and time.monotonic() - circuit.opened_at >= self.cooldown_seconds:
+                circuit.state = HALF_OPEN
+                circuit.probing = False
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return True
+            circuit.fast_failures += 1
+            # what the call would probably have cost, judging by the failures that opened it
+            circuit.seconds_saved += circuit.avg_failure_seconds
+            return False
+
+    def record(self, url: str, success: bool, seconds: float):
+        # outcome of a call that allow() let through
+        with self.lock:
+            circuit = self._circuit(url)
+            circuit.probing = False
+            if success and seconds <= self.slow_seconds:
+                circuit.state = CLOSED
+                circuit.consecutive_failures = 0
+                return
+            circuit.consecutive_failures += 1
+            n = circuit.consecutive_failures
+            circuit.avg_failure_seconds += (seconds - circuit.avg_failure_seconds) / n
+            if circuit.state == HALF_OPEN or n >= self.failure_threshold:
+                if circuit.state != OPEN:
+                    circuit.trips += 1
+                    print(f"  circuit open for {registrable_domain(url)} after {n} failures, "
+                          f"skipping it for {self.cooldown_seconds:.0f}s")
+                circuit.state = OPEN
+                circuit.opened_at = time.monotonic()
+
+    def cancel(self, url: str):
+        # a call allow() let through was abandoned before it finished: nothing to record,
+        # but free the half-open probe so the next call can take it
+        with self.lock:
+            self._circuit(url).probing = False
+
+    def print_report(self):
+        tripped = {domain: c for domain, c in self.circuits.items() if c.trips}
+        if not tripped:
+            return
+        print("circuit breakers:")
+        for domain, c in sorted(tripped.items()):
+            print(f"  {domain:<20} {c.state}, opened {c.trips}x, {c.fast_failures} calls failed fast "
+                  f"(~{c.seconds_saved:.0f}s saved)")
@@ -5,6 +5,7 @@ Search on Google using browser automation
 
 import sys
 from playwright_mcp_bridge import PlaywrightMCPBridge
+from selector_race import race_selectors, SEARCH_BOX_TIMEOUT_MS
 import time
 
 def search_google(search_term: str):
@@ -33,22 +34,17 @@ def search_google(search_term: str):
         ]
         
         search_success = False
-        for selector in search_selectors:
-            try:
-                element = browser.page.wait_for_selector(selector, timeout=3000)
-                if element and element.is_visible():
-                    print(f"  Found search box with: {selector}")
-                    element.click()
-                    time.sleep(0.5)
-                    element.fill(search_term)
-                    time.sleep(0.5)
-                    element.press('Enter')
-                    print(f"  Search submitted!")
-                    search_success = True
-                    break
-            except Exception as e:
-                print(f"  Selector {selector} failed: {e}")
-                continue
+        match = race_selectors(browser.page, search_selectors, SEARCH_BOX_TIMEOUT_MS)
+        if match:
+            selector, element = match
+            print(f"  Found search box with: {selector}")
+            element.click()
+            time.sleep(0.5)
+            element.fill(search_term)
+            time.sleep(0.5)
+            element.press('Enter')
+            print(f"  Search submitted!")
+            search_success = True
         
         if not search_success:
             print("Could not find search box")
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
+
+
+SEARCH_SYSTEM_PROMPT = "You are a browser automation assistant using MCP protocol. Extract product information and return it in JSON format only."
+CART_SYSTEM_PROMPT = "You are a browser automation assistant using MCP protocol. Perform actions and return results in JSON format only."
+
+EMPTY_PRODUCT = {"price": None, "product_url": None, "product_name": None}
+CART_PARSE_FAILED = {"success": False, "cart_url": None, "message": "Failed to parse response"}
+
+# concurrent requests to the llm api, and (part, site) lookups per request in batched mode
+DEFAULT_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+DEFAULT_BATCH_SIZE = int(os.getenv('LLM_BATCH_SIZE', '8'))
+
+
+def search_prompt(part_name: str, website_url: str) -> str:
+    return f"""Using browser automation through MCP protocol:
+        1. Navigate to {website_url}
+        2. Search for the part: {part_name}
+        3. Find the first matching product result
+        4. Extract the product price and product URL
+        5. Return the information in JSON format: {{"price": "XX.XX", "product_url": "https://...", "product_name": "..."}}
+
+        If the part is not found, return {{"price": null, "product_url": null, "product_name": null}}
+        """
+
+
+def cart_prompt(product_url: str) -> str:
+    return f"""Using browser automation through MCP protocol:
+        1. Navigate to {product_url}
+        2. Find and click the "Add to Cart" or "Add to Basket" button
+        3. Wait for confirmation that the item was added
+        4. Get the current cart URL
+        5. Return the result in JSON format: {{"success": true/false, "cart_url": "https://...", "message": "..."}}
+        """
+
+
+def batch_search_prompt(pairs: List[Tuple[str, str]]) -> str:
+    lines = '\n'.join(f"        {i}. part: {part_name} | website: {website_url}"
+                      for i, (part_name, website_url) in enumerate(pairs, start=1))
+    return f"""Using browser automation through MCP protocol, handle each of these searches:
+{lines}
+
+        For each one, navigate to the website, search for the part and extract the first matching product's price and URL.
+        Return a JSON array with exactly {len(pairs)} objects in the same order, each {{"price": "XX.XX", "product_url": "https://...", "product_name": "..."}}
+        Use {{"price": null, "product_url": null, "product_name": null}} for parts that are not found.
+        """
+
+
+def batch_cart_prompt(product_urls: List[str]) -> str:
+    lines = '\n'.join(f"        {i}. {url}" for i, url in enumerate(product_urls, start=1))
+    return f"""Using browser automation through MCP protocol, add each of these products to the cart:
+{lines}
+
+        Return a JSON array with exactly {len(product_urls)} objects in the same order, each {{"success": true/false, "cart_url": "https://...", "message": "..."}}
+        """
+
+
+def extract_json(text: Optional[str], default: Dict) -> Dict:
+    # first {...} span of the response, or default if there is none or it doesn't parse
+    text = text or ''
+    json_start = text.find('{')
+    json_end = text.rfind('}') + 1
+    if json_start < 0 or json_end <= json_start:
+        return dict(default)
+    try:
+        return json.loads(text[json_start:json_end])
+    except ValueError:
+        return dict(default)
+
+
+def extract_json_list(text: Optional[str], length: int) -> Optional[List[Dict]]:
+    # the [...] array of a batched response, or None unless it has exactly `length` objects
+    text = text or ''
+    json_start = text.find('[')
+    json_end = text.rfind(']') + 1
+    if json_start < 0 or json_end <= json_start:
+        return None
+    try:
+        items = json.loads(text[json_start:json_end])
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != length or not all(isinstance(i, dict) for i in items):
+        return None
+    return items
+
+
+def _chunks(items: List, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class LLMSimulator:
+    # dry-run planner: simulates searches and cart adds with concurrent async llm calls
+    # batch_size > 1 packs several lookups into one request, which suits local servers
+    # where per-request overhead dominates
+    def __init__(self, api_key: str, model_name: str, base_url: str = None,
+                 max_concurrency: int = None, batch_size: int = 1):
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url) if base_url else AsyncOpenAI(api_key=api_key)
+        self.model_name = model_name
+        self.max_concurrency = max(1, max_concurrency or DEFAULT_MAX_CONCURRENCY)
+        self.batch_size = max(1, batch_size)
+        self.semaphore = None
+        self.lookups = 0
+        self.requests = 0
+        self.seconds = 0.0
+
+    async def _complete(self, system_prompt: str, prompt: str) -> str:
+        async with self.semaphore:
+            self.requests += 1
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3
+            )
+        return response.choices[0].message.content
+
+    async def search(self, part_name: str, website_url: str) -> Dict[str, Optional[str]]:
+        try:
+            return extract_json(await self._complete(SEARCH_SYSTEM_PROMPT, search_prompt(part_name, website_url)), EMPTY_PRODUCT)
+        except Exception as e:
+            print(f"error searching for {part_name} on {website_url}: {e}")
+            return dict(EMPTY_PRODUCT)
+
+    async def add_to_cart(self, product_url: str) -> Dict[str, any]:
+        try:
+            return extract_json(await self._complete(CART_SYSTEM_PROMPT, cart_prompt(product_url)), CART_PARSE_FAILED)
+        except Exception as e:
+            print(f"error adding {product_url} to cart: {e}")
+            return {"success": False, "cart_url": None, "message": str(e)}
+
+    async def _search_batch(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        # one request for the whole batch; fall back to single requests if the answer doesn't line up
+        if len(pairs) > 1:
+            try:
+                items = extract_json_list(await self._complete(SEARCH_SYSTEM_PROMPT, batch_search_prompt(pairs)), len(pairs))
+                if items is not None:
+                    return [dict(EMPTY_PRODUCT, **item) for item in items]
+            except Exception as e:
+                print(f"batched search failed, retrying one by one: {e}")
+        return list(await asyncio.gather(*(self.search(part_name, website) for part_name, website in pairs)))
+
+    async def _cart_batch(self, product_urls: List[str]) -> List[Dict]:
+        if len(product_urls) > 1:
+            try:
+                items = extract_json_list(await self._complete(CART_SYSTEM_PROMPT, batch_cart_prompt(product_urls)), len(product_urls))
+                if items is not None:
+                    return [dict(CART_PARSE_FAILED, **item) for item in items]
+            except Exception as e:
+                print(f"batched cart add failed, retrying one by one: {e}")
+        return list(await asyncio.gather(*(self.add_to_cart(url) for url in product_urls)))
+
+    async def run(self, websites_map: Dict[str, List[str]]) -> Dict[str, List[Dict]]:
+        # simulate every (part, website) search, then the cart adds for found products
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        start = time.perf_counter()
+        pairs = [(part_name, website) for part_name, websites in websites_map.items() for website in websites]
+        self.lookups += len(pairs)
+
+        batches = list(_chunks(pairs, self.batch_size))
+        infos = [info for batch in await asyncio.gather(*(self._search_batch(b) for b in batches)) for info in batch]
+        for info, (_, website) in zip(infos, pairs):
+            info['website'] = website
+            info['cart_url'] = None
+            info['added_to_cart'] = False
+
+        found = [info for info in infos if info.get('product_url')]
+        url_batches = list(_chunks([info['product_url'] for info in found], self.batch_size))
+        cart_results = [r for batch in await asyncio.gather(*(self._cart_batch(b) for b in url_batches)) for r in batch]
+        for info, cart_result in zip(found, cart_results):
+            info['cart_url'] = cart_result.get('cart_url')
+            info['added_to_cart'] = cart_result.get('success', False)
+
+        results: Dict[str, List[Dict]] = {part_name: [] for part_name in websites_map}
+        for info, (part_name, _) in zip(infos, pairs):
+            results[part_name].append(info)
+        self.seconds = time.perf_counter() - start
+        return results
+
+    def print_report(self):
+        print(f"llm simulation: {self.lookups} searches in {self.requests} requests, {self.seconds:.1f}s "
+              f"(concurrency={self.max_concurrency}, batch_size={self.batch_size})")
@@ -1,9 +1,20 @@
 import os
+import asyncio
 import argparse
 from bom_parser import BOMParser
 from website_finder import WebsiteFinder
 from browser_controller import BrowserController
 from csv_updater import CSVUpdater
+from pipeline import SearchCartPipeline
+from cart_builder import CartBuilder
+from circuit_breaker import CircuitBreaker
+from search_strategy import SearchStrategy, STRATEGIES, EXHAUSTIVE
+from wait_strategy import PACING_PROFILES
+from politeness import PolitenessScheduler, load_policies
+from browser_profiles import ProfileStore
+from resource_filter import ResourceFilter
+from search_cache import SearchCache, NegativeCache
+from url_utils import plan_suppliers
 
 
 def main():
@@ -12,6 +23,9 @@ def main():
     parser.add_argument('--num-websites', type=int, default=3, help='number of websites to search per part')
     parser.add_argument('--output', type=str, default=None, help='output csv file path')
     parser.add_argument('--gemini-key', type=str, default=None, help='gemini api key')
+    parser.add_argument('--discovery-workers', type=int, default=4, help='concurrent gemini lookups when finding websites')
+    parser.add_argument('--no-classifier', action='store_true', help='always ask gemini for websites instead of routing known part categories locally')
+    parser.add_argument('--gemini-rps', type=float, default=1.0, help='max gemini requests per second across all workers')
     parser.add_argument('--openai-key', type=str, default=None, help='openai api key')
     parser.add_argument('--use-open-source', action='store_true', help='use open source model instead of openai')
     parser.add_argument('--model-name', type=str, default=None, help='model name (e.g., llama3.1, gpt-4)')
@@ -19,29 +33,76 @@ def main():
     parser.add_argument('--headless', action='store_true', help='run browser in headless mode (invisible, faster)')
     parser.add_argument('--show-browser', action='store_true', help='show browser window (opposite of headless)')
     parser.add_argument('--no-browser', action='store_true', help='use llm simulation instead of real browser')
+    parser.add_argument('--workers', type=int, default=1, help='number of parts processed in parallel (one browser per worker)')
+    parser.add_argument('--concurrent-sites', action='store_true', help="search all of a part's websites at the same time with async playwright")
+    parser.add_argument('--pipeline', action='store_true', help='run searches and cart adds as separate overlapping stages')
+    parser.add_argument('--search-workers', type=int, default=2, help='search stage browsers when using --pipeline')
+    parser.add_argument('--cart-workers', type=int, default=2, help='max concurrent cart adds when using --pipeline')
+    parser.add_argument('--politeness-config', type=str, default=None, help='json file of per-domain rate/burst/max_concurrency limits')
+    parser.add_argument('--persist-profiles', action='store_true', help='keep cookies and consent state per supplier between runs')
+    parser.add_argument('--reset-profiles', action='store_true', help='delete saved supplier profiles before running')
+    parser.add_argument('--no-block-resources', action='store_true', help='load images, fonts, trackers and chat widgets instead of blocking them')
+    parser.add_argument('--no-cache', action='store_true', help='do not read or write the search result cache')
+    parser.add_argument('--refresh-cache', action='store_true', help='ignore cached search results but store the new ones')
+    parser.add_argument('--cache-ttl-hours', type=float, default=None, help='how long cached search results stay fresh (default 24)')
+    parser.add_argument('--miss-ttl-hours', type=float, default=None, help='how long a site is skipped for a part it had no result for (default 6)')
+    parser.add_argument('--supplier-carts', action='store_true', help='search first, then fill one cart per supplier with bom quantities')
+    parser.add_argument('--llm-concurrency', type=int, default=None, help='concurrent llm requests in --no-browser mode (default 8)')
+    parser.add_argument('--llm-batch-size', type=int, default=None, help='lookups per llm request in --no-browser mode (default 8 for open source servers, else 1)')
+    parser.add_argument('--no-circuit-breaker', action='store_true', help='keep trying suppliers that repeatedly fail or time out')
+    parser.add_argument('--strategy', choices=STRATEGIES, default=EXHAUSTIVE,
+                        help='first: stop at the first acceptable match; best-price: cheapest match found within --time-budget; exhaustive: search every site')
+    parser.add_argument('--time-budget', type=float, default=60.0, help='seconds per part for the best-price strategy')
+    parser.add_argument('--min-similarity', type=float, default=0.5, help='minimum part/product name similarity (0-1) for a match to be acceptable')
+    parser.add_argument('--pacing', choices=sorted(PACING_PROFILES), default=None,
+                        help='how long the browser lingers between actions: human (old fixed delays), balanced (default), fast')
+    parser.add_argument('--fresh-browser', action='store_true', help='launch a new browser for every search and cart add instead of one session per run')
     
     args = parser.parse_args()
     
+    # flags the chosen processing path would silently ignore
+    if args.pipeline and not args.supplier_carts and args.strategy != EXHAUSTIVE:
+        parser.error('--pipeline searches every site and carts every hit, it only supports --strategy exhaustive')
+    if args.no_browser and not args.supplier_carts and not args.pipeline:
+        if args.strategy != EXHAUSTIVE:
+            parser.error('--no-browser simulates every site, it only supports --strategy exhaustive')
+        if args.workers > 1:
+            parser.error('--no-browser ignores --workers, use --llm-concurrency instead')
+    
     # determine headless mode
     headless = args.headless and not args.show_browser
     
     print("=== bom automated ordering system ===\n")
     
-    # step 1: parse the bom csv
-    print("step 1: parsing bom csv...")
+    # step 1: open the bom csv as a lazy stream of unique part names
+    print("step 1: reading bom csv...")
     bom_parser = BOMParser(args.csv_file)
-    parts = bom_parser.get_parts()
-    part_names = bom_parser.get_part_names()
-    print(f"found {len(part_names)} parts in bom\n")
+    if bom_parser.is_hierarchical():
+        # multi-level bom: search each unique leaf part once, not once per occurrence
+        purchase_list = bom_parser.get_purchase_list()
+        occurrences = sum(line.occurrences for line in purchase_list)
+        print(f"multi-level bom: {occurrences} leaf occurrences rolled up into {len(purchase_list)} unique parts")
+        part_names = (line.name for line in purchase_list)
+    else:
+        part_names = bom_parser.iter_part_names(unique=True)
     
-    # step 2: find relevant websites using gemini
+    # step 2: find relevant websites using gemini (consumes the bom stream)
     print("step 2: finding relevant websites using gemini...")
     website_finder = WebsiteFinder(
         api_key=args.gemini_key,
-        num_websites=args.num_websites
+        num_websites=args.num_websites,
+        max_workers=args.discovery_workers,
+        requests_per_second=args.gemini_rps,
+        use_classifier=not args.no_classifier
     )
     websites_map = website_finder.find_websites_for_parts(part_names)
-    print(f"found websites for all parts\n")
+    print(f"found websites for {len(websites_map)} unique parts")
+    
+    # canonicalize and dedupe supplier sites within each part and across the bom
+    supplier_plan = plan_suppliers(websites_map)
+    websites_map = supplier_plan.websites
+    print(f"{supplier_plan.visits} part/site searches across {len(supplier_plan.parts_by_supplier)} distinct suppliers "
+          f"({supplier_plan.duplicate_visits_removed} duplicate sites removed)\n")
     
     # step 3: use browser automation to search and add to cart
     browser_mode = "headless" if headless else "visible"
@@ -53,35 +114,92 @@ def main():
         print("   consider using --show-browser for better success rate")
         print()
     
+    profiles = None
+    if args.persist_profiles or args.reset_profiles:
+        profiles = ProfileStore()
+        if args.reset_profiles:
+            profiles.reset()
+    
+    search_cache = negative_cache = None
+    if not args.no_browser and not args.no_cache:
+        search_cache = SearchCache(ttl_hours=args.cache_ttl_hours, refresh=args.refresh_cache)
+        negative_cache = NegativeCache(ttl_hours=args.miss_ttl_hours, refresh=args.refresh_cache)
+    
     browser_controller = BrowserController(
         api_key=args.openai_key,
         use_open_source=args.use_open_source,
         model_name=args.model_name,
         base_url=args.base_url,
         use_real_browser=not args.no_browser,
-        headless=headless
+        headless=headless,
+        session_scoped=not args.fresh_browser,
+        workers=args.workers,
+        scheduler=PolitenessScheduler(load_policies(args.politeness_config)) if not args.no_browser else None,
+        profiles=profiles if args.persist_profiles else None,
+        resource_filter=None if args.no_block_resources else ResourceFilter(),
+        search_cache=search_cache,
+        negative_cache=negative_cache,
+        llm_concurrency=args.llm_concurrency,
+        llm_batch_size=args.llm_batch_size,
+        breaker=None if args.no_browser or args.no_circuit_breaker else CircuitBreaker(),
+        strategy=SearchStrategy(args.strategy, time_budget=args.time_budget, min_similarity=args.min_similarity),
+        pacing=args.pacing
     )
     
-    all_results = {}
-    for part_name in part_names:
-        print(f"\nprocessing: {part_name}")
-        websites = websites_map.get(part_name, [])
-        if websites:
-            results = browser_controller.process_part_across_websites(part_name, websites)
-            all_results[part_name] = results
+    cart_builder = None
+    try:
+        if args.supplier_carts:
+            # search only, then add each supplier's products in one session
+            all_results = browser_controller.process_parts(websites_map, add_to_cart=False)
+            cart_builder = CartBuilder(browser_controller, bom_parser.get_quantities())
+            cart_builder.build(all_results)
+        elif args.pipeline:
+            pipeline = SearchCartPipeline(browser_controller, search_workers=args.search_workers,
+                                          cart_workers=args.cart_workers, headless=headless)
+            all_results = pipeline.run(websites_map)
+            pipeline.print_report()
+        elif args.concurrent_sites or args.no_browser:
+            # llm simulation always takes the async path, with concurrent (and for local servers batched) requests
+            all_results = asyncio.run(browser_controller.process_parts_async(websites_map))
         else:
-            print(f"  no websites found for {part_name}")
-            all_results[part_name] = []
+            all_results = browser_controller.process_parts(websites_map)
+    finally:
+        browser_controller.close()
+        if search_cache is not None:
+            search_cache.close()
+            negative_cache.close()
     
     print("\n")
     
     # step 4: append results to original csv
     print("step 4: updating csv with results...")
     csv_updater = CSVUpdater(args.csv_file, args.output)
-    output_path = csv_updater.append_results_to_csv(parts, all_results)
+    # original rows are streamed from the csv, so no parts list is passed
+    output_path = csv_updater.append_results_to_csv(None, all_results)
     
     print(f"\n=== process complete ===")
     print(f"results saved to: {output_path}")
+    if cart_builder is not None:
+        cart_builder.print_report()
+    browser_controller.strategy.print_report()
+    if browser_controller.simulator is not None:
+        browser_controller.simulator.print_report()
+    avoided = supplier_plan.duplicate_visits_removed + browser_controller.homepage_loads_skipped
+    print(f"homepage loads avoided: {avoided} "
+          f"({supplier_plan.duplicate_visits_removed} duplicate sites, {browser_controller.homepage_loads_skipped} reused sessions)")
+    if not args.no_browser:
+        print(f"browser launches: {browser_controller.browser_launches}")
+        print(f"direct results-page searches: {browser_controller.direct_searches}")
+        browser_controller.scheduler.print_report()
+        if browser_controller.breaker is not None:
+            browser_controller.breaker.print_report()
+        if search_cache is not None:
+            search_cache.print_report()
+            negative_cache.print_report()
+        if browser_controller.resource_filter is not None:
+            browser_controller.resource_filter.print_report()
+        if profiles is not None and args.persist_profiles:
+            print(f"supplier profiles: {profiles.loaded} warm contexts, {profiles.saved} saved to {profiles.directory}")
     
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+# (pattern, weight) rules per category; patterns are matched case-insensitively
+CATEGORY_RULES: Dict[str, List[Tuple[str, float]]] = {
+    'passive': [
+        (r'\bresistors?\b', 3.0), (r'\bcapacitors?\b', 3.0), (r'\binductors?\b', 3.0),
+        (r'\bferrite\b', 2.5), (r'\bthermistor\b', 2.0), (r'\bpotentiometer\b', 2.0), (r'\bcrystal\b', 2.0),
+        (r'\b\d+(\.\d+)?\s*[kmr]?\s*(ohms?|Ω)', 3.0), (r'\b\d+[kmr]\d*\b', 1.0),
+        (r'\b\d+(\.\d+)?\s*[pnuµ]f\b', 3.0), (r'\b\d+(\.\d+)?\s*[nuµm]h\b', 2.5),
+        (r'\b(0201|0402|0603|0805|1206|1210)\b', 2.0), (r'\b(smd|tht)\b', 0.5),
+    ],
+    'semiconductor': [
+        (r'\b(ic|mcu|microcontroller|fpga|eeprom)\b', 2.5), (r'\btransistors?\b', 3.0), (r'\bmosfet\b', 3.0),
+        (r'\bdiodes?\b', 2.5), (r'\bzener\b', 3.0), (r'\bregulator\b', 2.5), (r'\bop-?amp\b', 3.0),
+        (r'\b(ldo|buck|boost)\b', 1.5), (r'\b(sot-?23|soic|qfn|tqfp|dip-?\d+|to-?220)\b', 2.0),
+        (r'\b(atmega|stm32|lm\d{3,4}|ne555|2n\d{4}|1n\d{4})', 3.0),
+    ],
+    'connector': [
+        (r'\bconnectors?\b', 3.0), (r'\bheaders?\b', 2.5), (r'\bterminal block\b', 3.0), (r'\bjst\b', 3.0),
+        (r'\b(molex|dupont|jack|socket|receptacle|plug)\b', 2.0), (r'\b\d+(\.\d+)?\s*mm pitch\b', 2.0),
+    ],
+    'mechanical': [
+        (r'\b(screws?|bolts?|nuts?|washers?|standoffs?|spacers?|rivets?)\b', 3.0),
+        (r'\b(bearings?|brackets?|shafts?|springs?|hinges?|extrusion|couplers?)\b', 3.0),
+        (r'\bm\d(\.\d)?\s*x\s*\d+', 3.0), (r'\b(din|iso)\s*\d{3,4}\b', 2.5),
+        (r'\b(stainless|hex|socket head|button head|countersunk|nylon|aluminum|aluminium)\b', 1.0),
+    ],
+    'dev_board': [
+        (r'\b(arduino|raspberry pi|esp32|esp8266|teensy|feather|nucleo|pico)\b', 3.5),
+        (r'\b(breakout|dev(elopment)? board|shield|hat)\b', 2.5),
+    ],
+    'module': [
+        (r'\bsensors?\b', 2.5), (r'\b(lcd|oled|tft|display)\b', 2.5), (r'\b(servo|stepper|motor)s?\b', 2.5),
+        (r'\b(module|relay|buzzer|encoder|keypad)\b', 2.0), (r'\bhc-?sr04\b', 3.0), (r'\bsg90\b', 3.0),
+    ],
+    'prototyping': [
+        (r'\b(breadboard|perfboard|protoboard|stripboard)\b', 3.5), (r'\bjumper wires?\b', 3.0),
+        (r'\b(wire kit|hook-?up wire|dupont wires?)\b', 2.5),
+    ],
+    'cable': [
+        (r'\bcables?\b', 2.5), (r'\b(usb|hdmi|ribbon)\b', 1.0), (r'\bwires?\b', 1.0), (r'\bheat ?shrink\b', 2.5),
+    ],
+}
+
+# ranked supplier entry points per category
+SUPPLIER_ROUTES: Dict[str, List[str]] = {
+    'passive': ['https://www.digikey.com/', 'https://www.mouser.com/', 'https://www.newark.com/'],
+    'semiconductor': ['https://www.digikey.com/', 'https://www.mouser.com/', 'https://www.arrow.com/'],
+    'connector': ['https://www.digikey.com/', 'https://www.mouser.com/', 'https://www.newark.com/'],
+    'mechanical': ['https://www.mcmaster.com/', 'https://www.digikey.com/', 'https://www.mouser.com/'],
+    'dev_board': ['https://www.adafruit.com/', 'https://www.sparkfun.com/', 'https://www.digikey.com/'],
+    'module': ['https://www.adafruit.com/', 'https://www.sparkfun.com/', 'https://www.digikey.com/'],
+    'prototyping': ['https://www.adafruit.com/', 'https://www.sparkfun.com/', 'https://www.digikey.com/'],
+    'cable': ['https://www.digikey.com/', 'https://www.adafruit.com/', 'https://www.mouser.com/'],
+}
+
+_COMPILED_RULES = {
+    category: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in rules]
+    for category, rules in CATEGORY_RULES.items()
+}
+
+
+class Classification(NamedTuple):
+    category: Optional[str]
+    confidence: float
+    score: float
+    suppliers: List[str]
+
+
+class PartClassifier:
+    def __init__(self, min_score: float = 2.5, min_confidence: float = 0.6):
+        # below either threshold the classifier is "unsure" and the caller should ask gemini
+        self.min_score = min_score
+        self.min_confidence = min_confidence
+
+    def score(self, part_name: str) -> Dict[str, float]:
+        # weighted keyword score per category
+        scores = {}
+        for category, rules in _COMPILED_RULES.items():
+            total = sum(weight for pattern, weight in rules if pattern.search(part_name))
+            if total:
+                scores[category] = total
+        return scores
+
+    def classify(self, part_name: str) -> Classification:
+        # best category, its share of the total score as confidence, and its supplier route
+        scores = self.score(part_name)
+        if not scores:
+            return Classification(None, 0.0, 0.0, [])
+        category, best = max(scores.items(), key=lambda item: item[1])
+        confidence = best / sum(scores.values())
+        return Classification(category, confidence, best, list(SUPPLIER_ROUTES[category]))
+
+    def is_confident(self, result: Classification) -> bool:
+        return result.score >= self.min_score and result.confidence >= self.min_confidence
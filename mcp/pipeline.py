@@ -0,0 +1,140 @@
+import threading
+import time
+from typing import Dict, List, Optional
+from browser_pool import BrowserPool
+from politeness import interleave
+from url_utils import registrable_domain
+
+
+class StageMetrics:
+    # throughput, busy time and queueing for one pipeline stage (thread-safe)
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.lock = threading.Lock()
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.depth = 0
+        self.max_depth = 0
+
+    def enqueued(self) -> float:
+        with self.lock:
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+        return time.perf_counter()
+
+    def started(self, enqueued_at: float) -> float:
+        now = time.perf_counter()
+        with self.lock:
+            self.depth -= 1
+            self.wait_seconds += now - enqueued_at
+        return now
+
+    def finished(self, started_at: float):
+        with self.lock:
+            self.items += 1
+            self.busy_seconds += time.perf_counter() - started_at
+
+    def utilization(self, wall_seconds: float) -> float:
+        # share of the stage's worker time spent busy
+        capacity = wall_seconds * self.concurrency
+        return self.busy_seconds / capacity if capacity else 0.0
+
+    def summary(self, wall_seconds: float) -> str:
+        avg_service = self.busy_seconds / self.items if self.items else 0.0
+        avg_wait = self.wait_seconds / self.items if self.items else 0.0
+        return (f"{self.name:<7} workers={self.concurrency} items={self.items} busy={self.busy_seconds:.1f}s "
+                f"avg={avg_service:.1f}s queue_wait={avg_wait:.1f}s max_queue={self.max_depth} "
+                f"utilization={self.utilization(wall_seconds):.0%}")
+
+
+class SearchCartPipeline:
+    # search workers feed found products to per-site cart workers, so searching
+    # part k+1 overlaps with carting part k
+    def __init__(self, controller, search_workers: int = 2, cart_workers: int = 2, headless: bool = False):
+        self.controller = controller
+        self.search_workers = max(1, search_workers)
+        self.cart_workers = max(1, cart_workers)
+        self.headless = headless
+        self.search_metrics = StageMetrics('search', self.search_workers)
+        self.cart_metrics = StageMetrics('cart', self.cart_workers)
+        self.wall_seconds = 0.0
+
+    def run(self, websites_map: Dict[str, List[str]]) -> Dict[str, List[Dict]]:
+        # process every (part, website) pair and return results in the usual shape
+        results: Dict[str, List[Optional[Dict]]] = {part: [None] * len(sites) for part, sites in websites_map.items()}
+        search_pool = BrowserPool(self.search_workers, headless=self.headless, name='search',
+                                  profiles=self.controller.profiles, resource_filter=self.controller.resource_filter,
+                                  pacing=self.controller.pacing)
+        # one single-worker pool per site keeps each site's cart in one browser context
+        cart_pools: Dict[str, BrowserPool] = {}
+        cart_slots = threading.Semaphore(self.cart_workers)
+        cart_futures = []
+        lock = threading.Lock()
+
+        def cart(job):
+            part_name, index, info, enqueued_at = job
+            with cart_slots:
+                started_at = self.cart_metrics.started(enqueued_at)
+                try:
+                    cart_result = self.controller.add_to_cart(info['product_url'])
+                    info['cart_url'] = cart_result.get('cart_url')
+                    info['added_to_cart'] = cart_result.get('success', False)
+                finally:
+                    self.cart_metrics.finished(started_at)
+
+        def search(job):
+            part_name, index, website, enqueued_at = job
+            started_at = self.search_metrics.started(enqueued_at)
+            try:
+                print(f"  searching {part_name} on {website}")
+                info = self.controller.search_part_on_website(part_name, website)
+            finally:
+                self.search_metrics.finished(started_at)
+
+            info['website'] = website
+            info['cart_url'] = None
+            info['added_to_cart'] = False
+            results[part_name][index] = info
+            if info.get('product_url'):
+                site = registrable_domain(website)
+                with lock:
+                    if site not in cart_pools:
+                        cart_pools[site] = BrowserPool(1, headless=self.headless, name=f'cart-{site}',
+                                                     profiles=self.controller.profiles, resource_filter=self.controller.resource_filter,
+                                                     pacing=self.controller.pacing)
+                    cart_futures.append(cart_pools[site].submit(cart, (part_name, index, info, self.cart_metrics.enqueued())))
+
+        start = time.perf_counter()
+        try:
+            # alternate suppliers so one slow domain doesn't hold up every search worker
+            jobs = interleave(
+                ((part_name, index, website) for part_name, websites in websites_map.items()
+                 for index, website in enumerate(websites)),
+                key=lambda job: registrable_domain(job[2])
+            )
+            search_futures = [
+                search_pool.submit(search, (part_name, index, website, self.search_metrics.enqueued()))
+                for part_name, index, website in jobs
+            ]
+            for future in search_futures:
+                future.result()
+            # every search is done, so no more cart jobs can be added
+            for future in cart_futures:
+                future.result()
+        finally:
+            for pool in [search_pool, *cart_pools.values()]:
+                pool.close()
+                self.controller.browser_launches += pool.launches
+            self.wall_seconds = time.perf_counter() - start
+
+        return {part: [info for info in infos if info is not None] for part, infos in results.items()}
+
+    def print_report(self):
+        # per-stage metrics and the stage that limits throughput
+        print(f"pipeline finished in {self.wall_seconds:.1f}s")
+        for metrics in (self.search_metrics, self.cart_metrics):
+            print(f"  {metrics.summary(self.wall_seconds)}")
+        slowest = max((self.search_metrics, self.cart_metrics), key=lambda m: m.utilization(self.wall_seconds))
+        print(f"  bottleneck: {slowest.name} stage")
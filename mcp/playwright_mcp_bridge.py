@@ -1,27 +1,78 @@
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
-import time
-import random
 from typing import Dict, Optional
+from url_utils import registrable_domain
+from browser_profiles import ProfileStore
+from resource_filter import ResourceFilter
+from wait_strategy import PageWaits, get_profile
+from selector_race import race_selectors, SEARCH_BOX_TIMEOUT_MS, CART_BUTTON_TIMEOUT_MS
+from site_selectors import (CLOUDFLARE_INDICATORS, POPUP_SELECTORS, SEARCH_SELECTORS, PRODUCT_SELECTORS,
+                            NAME_SELECTORS, PRICE_SELECTORS, CART_BUTTON_SELECTORS, CART_LINK_SELECTORS, site_key,
+                            search_url, QUANTITY_SELECTORS, CART_URLS)
+
+
+# stealth javascript to hide automation
+STEALTH_SCRIPT = """
+    // overwrite the navigator.webdriver property
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => false
+    });
+    
+    // overwrite the navigator.plugins property
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5]
+    });
+    
+    // overwrite the navigator.languages property
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en']
+    });
+    
+    // chrome property
+    window.chrome = {
+        runtime: {}
+    };
+    
+    // permissions
+    const originalQuery = window.navigator.permissions.query;
+    window.navigator.permissions.query = (parameters) => (
+        parameters.name === 'notifications' ?
+            Promise.resolve({ state: Notification.permission }) :
+            originalQuery(parameters)
+    );
+"""
 
 
 class PlaywrightMCPBridge:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, profiles: ProfileStore = None, resource_filter: ResourceFilter = None,
+                 pacing: str = None):
         # headless=False means browser window is VISIBLE (recommended for cloudflare sites)
         # headless=True means browser runs in background (faster but detected by cloudflare)
         self.headless = headless
+        # saved per-site cookies/consent state, loaded into each site context
+        self.profiles = profiles
+        self.warm_sites = set()
+        # optional blocking of images, fonts, trackers and other unused requests
+        self.resource_filter = resource_filter
         self.playwright = None
         self.browser = None
         self.context = None
+        # context created by start(), replaced by site contexts in session mode
+        self.default_context = None
         self.page = None
+        # true when the last extraction saw a real results page with no product,
+        # not a cloudflare challenge or an error
+        self.results_empty = False
+        # true once search_product has waited for this page's results
+        self.results_waited = False
+        # per-site contexts (cookies, cart session) when one browser serves many sites
+        self.site_contexts = {}
         
-        # human-like behavior settings
-        self.min_delay = 2.0
-        self.max_delay = 5.0
-        self.typing_delay_min = 100
-        self.typing_delay_max = 250
+        # pacing profile: waits on page events, with short random pauses in between
+        self.waits = PageWaits(get_profile(pacing))
         
-    def start(self):
+    def start(self, site_url: str = None):
         # start playwright and launch browser with stealth settings
+        # site_url makes the first context that site's context, with its profile and filter overrides
         if self.headless:
             print(f"  ⚠️  warning: headless mode may be detected by cloudflare/digikey")
             print(f"  consider using --show-browser for better success rate")
@@ -44,8 +95,19 @@ class PlaywrightMCPBridge:
             ]
         )
         
+        self.context, self.page = self._new_context(site_url)
+        self.default_context = self.context
+        if site_url:
+            self.site_contexts[registrable_domain(site_url)] = (self.context, self.page)
+    
+    def _new_context(self, site_url: str = None):
         # create context with realistic browser fingerprint
-        self.context = self.browser.new_context(
+        # and the site's saved profile if there is one
+        state = self.profiles.state_for(site_url) if self.profiles and site_url else None
+        if state:
+            self.warm_sites.add(registrable_domain(site_url))
+        context = self.browser.new_context(
+            storage_state=state,
             viewport={'width': 1920, 'height': 1080},
             user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             locale='en-US',
@@ -65,63 +127,61 @@ class PlaywrightMCPBridge:
             }
         )
         
-        self.page = self.context.new_page()
+        if self.resource_filter:
+            self.resource_filter.install(context, site_url)
+        
+        page = context.new_page()
         
         # add stealth javascript to hide automation
-        self.page.add_init_script("""
-            // overwrite the navigator.webdriver property
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => false
-            });
-            
-            // overwrite the navigator.plugins property
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5]
-            });
-            
-            // overwrite the navigator.languages property
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en']
-            });
-            
-            // chrome property
-            window.chrome = {
-                runtime: {}
-            };
-            
-            // permissions
-            const originalQuery = window.navigator.permissions.query;
-            window.navigator.permissions.query = (parameters) => (
-                parameters.name === 'notifications' ?
-                    Promise.resolve({ state: Notification.permission }) :
-                    originalQuery(parameters)
-            );
-        """)
+        page.add_init_script(STEALTH_SCRIPT)
+        return context, page
+    
+    def use_site(self, url: str) -> bool:
+        # switch to the context for this url's site, creating it on first use
+        # returns True if a new context was created
+        site = registrable_domain(url)
+        existing = self.site_contexts.get(site)
+        created = existing is None or existing[1].is_closed()
+        if created:
+            if existing is not None:
+                # the page crashed or was closed, replace the whole context
+                try:
+                    existing[0].close()
+                except:
+                    pass
+            self.site_contexts[site] = self._new_context(url)
+        self.context, self.page = self.site_contexts[site]
+        return created
+    
+    def is_on_site(self, url: str) -> bool:
+        # true if the current page is already on the same site as url
+        if not self.page or not self.page.url.startswith('http'):
+            return False
+        return registrable_domain(self.page.url) == registrable_domain(url)
+    
+    def is_alive(self) -> bool:
+        # false once the browser has crashed or been closed
+        return bool(self.browser and self.browser.is_connected())
         
     def navigate(self, url: str) -> bool:
         # navigate to url with human-like behavior
         try:
             print(f"  navigating to {url}")
+            self.results_waited = False
             self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
             
-            # wait for page to be more fully loaded
-            try:
-                self.page.wait_for_load_state('networkidle', timeout=10000)
-            except:
-                pass  # continue anyway
-            
-            # human-like delay after navigation (3-5 seconds)
-            delay = random.uniform(self.min_delay, self.max_delay)
-            print(f"  waiting {delay:.1f}s (mimicking human behavior)...")
-            time.sleep(delay)
+            # wait for page to be more fully loaded, then linger per the pacing profile
+            self.waits.network_quiet(self.page)
+            self.waits.settle()
             
             # check if we hit cloudflare challenge
             if self._detect_cloudflare():
                 print(f"  ⚠️  cloudflare challenge detected - waiting for resolution...")
-                time.sleep(10)  # give cloudflare time to resolve
+                self.waits.challenge_cleared(self.page)
             
-            # handle cookie banners and popups
-            self._dismiss_popups()
+            # handle cookie banners and popups, already accepted in a warm profile
+            if registrable_domain(self.page.url) not in self.warm_sites:
+                self._dismiss_popups()
                 
             return True
         except Exception as e:
@@ -132,41 +192,16 @@ class PlaywrightMCPBridge:
         # detect if we're on a cloudflare challenge page
         try:
             page_content = self.page.content().lower()
-            cloudflare_indicators = [
-                'cloudflare',
-                'checking your browser',
-                'just a moment',
-                'ddos protection',
-                'ray id'
-            ]
+            cloudflare_indicators = CLOUDFLARE_INDICATORS
             return any(indicator in page_content for indicator in cloudflare_indicators)
         except:
             return False
     
-    def _human_delay(self, min_sec: float = None, max_sec: float = None):
-        # random delay to mimic human behavior
-        min_sec = min_sec or self.min_delay
-        max_sec = max_sec or self.max_delay
-        delay = random.uniform(min_sec, max_sec)
-        time.sleep(delay)
-    
     def _dismiss_popups(self):
         # try to dismiss common popups, cookie banners, etc
         try:
             # common cookie banner and popup close buttons
-            close_selectors = [
-                'button:has-text("Accept")',
-                'button:has-text("Accept All")',
-                'button:has-text("I Agree")',
-                'button:has-text("OK")',
-                'button:has-text("Close")',
-                '[aria-label="Close"]',
-                '.close-button',
-                '#onetrust-accept-btn-handler',  # common cookie consent
-                '.cookie-accept',
-                '[class*="cookie"] button',
-                '[id*="cookie"] button'
-            ]
+            close_selectors = POPUP_SELECTORS
             
             for selector in close_selectors:
                 try:
@@ -174,30 +209,42 @@ class PlaywrightMCPBridge:
                     if button and button.is_visible():
                         print(f"  dismissing popup/banner...")
                         button.click()
-                        time.sleep(0.5)
+                        self.waits.think()
                         break
                 except:
                     continue
         except:
             pass  # if popup dismissal fails, continue anyway
     
-    def search_product(self, search_term: str) -> bool:
-        # find search box and search for product
+    def search_product(self, search_term: str, site_url: str = None, direct: bool = True) -> bool:
+        # open the site's results page directly when it has a template,
+        # otherwise find the search box on the current page
         try:
             print(f"  searching for: {search_term}")
-            current_url = self.page.url.lower()
+            previous_url = self.page.url
+            results_url = search_url(site_url or previous_url, search_term) if direct else None
+            current_url = previous_url.lower()
             
             # site-specific search logic
-            if 'digikey' in current_url:
-                return self._search_digikey(search_term)
+            if results_url:
+                searched = self.navigate(results_url)
+            elif 'digikey' in current_url:
+                searched = self._search_digikey(search_term)
             elif 'mouser' in current_url:
-                return self._search_mouser(search_term)
+                searched = self._search_mouser(search_term)
             elif 'adafruit' in current_url:
-                return self._search_adafruit(search_term)
+                searched = self._search_adafruit(search_term)
             elif 'sparkfun' in current_url:
-                return self._search_sparkfun(search_term)
+                searched = self._search_sparkfun(search_term)
             else:
-                return self._search_generic(search_term)
+                searched = self._search_generic(search_term)
+            
+            if searched:
+                # the one wait for results, extract_product_info doesn't repeat it
+                self.results_waited = True
+                if self.waits.results_ready(self.page, PRODUCT_SELECTORS[site_key(self.page.url)], previous_url):
+                    print(f"  results loaded")
+            return searched
             
         except Exception as e:
             print(f"  error searching: {e}")
@@ -207,22 +254,12 @@ class PlaywrightMCPBridge:
         # digikey-specific search with human-like behavior (cloudflare protected)
         try:
             # small random delay before interacting
-            time.sleep(random.uniform(1, 2))
+            self.waits.think()
             
             # try to dismiss any popups first
             self._dismiss_popups()
             
-            # digikey uses multiple possible selectors
-            selectors = [
-                '#searchInput',
-                'input[data-testid="search-input"]',
-                'input[id="searchInput"]',
-                'input[name="keywords"]',
-                'input[placeholder*="Part Number" i]',
-                'input[type="text"][class*="search"]',
-                '#searchform input',
-                'header input[type="text"]'
-            ]
+            selectors = SEARCH_SELECTORS['digikey']
             
             print(f"  looking for search box on digikey...")
             
@@ -234,42 +271,24 @@ class PlaywrightMCPBridge:
                 except:
                     pass
             
-            for i, selector in enumerate(selectors):
-                try:
-                    print(f"  trying selector {i+1}/{len(selectors)}: {selector}")
-                    element = self.page.wait_for_selector(selector, timeout=3000)
-                    if element and element.is_visible():
-                        print(f"  ✓ found search box with: {selector}")
-                        
-                        # scroll to element if needed
-                        element.scroll_into_view_if_needed()
-                        time.sleep(0.5)
-                        
-                        # human-like interaction: click, wait, then type slowly
-                        element.click()
-                        time.sleep(random.uniform(0.5, 1.5))
-                        
-                        # clear any existing text
-                        element.fill('')
-                        
-                        # type with random delays between keystrokes
-                        typing_delay = random.randint(self.typing_delay_min, self.typing_delay_max)
-                        print(f"  typing '{search_term}' with {typing_delay}ms delay...")
-                        element.type(search_term, delay=typing_delay)
-                        
-                        # small pause before pressing enter
-                        time.sleep(random.uniform(0.5, 1.0))
-                        element.press('Enter')
-                        
-                        # wait for results (human-like delay)
-                        delay = random.uniform(3, 5)
-                        print(f"  search submitted, waiting {delay:.1f}s for results...")
-                        time.sleep(delay)
-                        
-                        return True
-                except Exception as e:
-                    print(f"  selector {selector} failed: {str(e)[:50]}")
-                    continue
+            match = race_selectors(self.page, selectors, SEARCH_BOX_TIMEOUT_MS)
+            if match:
+                selector, element = match
+                print(f"  ✓ found search box with: {selector}")
+                
+                # scroll to element if needed
+                element.scroll_into_view_if_needed()
+                
+                # human-like interaction: click, wait, then type
+                element.click()
+                self.waits.think()
+                self._type_search(element, search_term)
+                
+                # small pause before pressing enter
+                self.waits.think()
+                self._submit_search(element)
+                
+                return True
             
             # if we get here, dump all input elements for debugging
             print(f"  ✗ no search box found, listing all input elements:")
@@ -294,78 +313,45 @@ class PlaywrightMCPBridge:
     def _search_mouser(self, search_term: str) -> bool:
         # mouser-specific search
         try:
-            selectors = [
-                'input[name="keyword"]',
-                '#searchInput',
-                'input[placeholder*="Search"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = self.page.wait_for_selector(selector, timeout=3000)
-                    if element and element.is_visible():
-                        element.click()
-                        element.fill(search_term)
-                        element.press('Enter')
-                        time.sleep(3)
-                        print(f"  mouser search submitted")
-                        return True
-                except:
-                    continue
-            
-            return False
+            match = race_selectors(self.page, SEARCH_SELECTORS['mouser'], SEARCH_BOX_TIMEOUT_MS)
+            if not match:
+                return False
+            _, element = match
+            element.click()
+            element.fill(search_term)
+            self._submit_search(element)
+            print(f"  mouser search submitted")
+            return True
         except:
             return False
     
     def _search_adafruit(self, search_term: str) -> bool:
         # adafruit-specific search
         try:
-            selectors = [
-                'input[name="q"]',
-                '#search_query_top',
-                'input[type="search"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = self.page.wait_for_selector(selector, timeout=3000)
-                    if element and element.is_visible():
-                        element.click()
-                        element.fill(search_term)
-                        element.press('Enter')
-                        time.sleep(3)
-                        print(f"  adafruit search submitted")
-                        return True
-                except:
-                    continue
-            
-            return False
+            match = race_selectors(self.page, SEARCH_SELECTORS['adafruit'], SEARCH_BOX_TIMEOUT_MS)
+            if not match:
+                return False
+            _, element = match
+            element.click()
+            element.fill(search_term)
+            self._submit_search(element)
+            print(f"  adafruit search submitted")
+            return True
         except:
             return False
     
     def _search_sparkfun(self, search_term: str) -> bool:
         # sparkfun-specific search
         try:
-            selectors = [
-                'input[name="q"]',
-                '#search-input',
-                'input[type="search"]'
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = self.page.wait_for_selector(selector, timeout=3000)
-                    if element and element.is_visible():
-                        element.click()
-                        element.fill(search_term)
-                        element.press('Enter')
-                        time.sleep(3)
-                        print(f"  sparkfun search submitted")
-                        return True
-                except:
-                    continue
-            
-            return False
+            match = race_selectors(self.page, SEARCH_SELECTORS['sparkfun'], SEARCH_BOX_TIMEOUT_MS)
+            if not match:
+                return False
+            _, element = match
+            element.click()
+            element.fill(search_term)
+            self._submit_search(element)
+            print(f"  sparkfun search submitted")
+            return True
         except:
             return False
     
@@ -373,42 +359,21 @@ class PlaywrightMCPBridge:
         # generic search for unknown sites with human-like behavior
         try:
             # small delay before searching
-            time.sleep(random.uniform(1, 2))
-            
-            search_selectors = [
-                'input[type="search"]',
-                'input[name="search"]',
-                'input[name="q"]',
-                'input[id*="search" i]',
-                'input[placeholder*="Search" i]',
-                '#search-input',
-                '.search-input',
-                '[data-testid="search-input"]',
-                'input[aria-label*="Search" i]'
-            ]
-            
-            for selector in search_selectors:
-                try:
-                    element = self.page.wait_for_selector(selector, timeout=3000)
-                    if element and element.is_visible():
-                        # human-like: click, wait, type slowly
-                        element.click()
-                        time.sleep(random.uniform(0.3, 0.8))
-                        
-                        # type with varying speed
-                        typing_delay = random.randint(80, 200)
-                        element.type(search_term, delay=typing_delay)
-                        
-                        # pause before enter
-                        time.sleep(random.uniform(0.3, 0.7))
-                        element.press('Enter')
-                        
-                        # human-like wait for results
-                        time.sleep(random.uniform(2.5, 4.0))
-                        print(f"  search submitted")
-                        return True
-                except:
-                    continue
+            self.waits.think()
+            
+            match = race_selectors(self.page, SEARCH_SELECTORS['generic'], SEARCH_BOX_TIMEOUT_MS)
+            if match:
+                _, element = match
+                # human-like: click, wait, type
+                element.click()
+                self.waits.think()
+                self._type_search(element, search_term)
+                
+                # pause before enter
+                self.waits.think()
+                self._submit_search(element)
+                print(f"  search submitted")
+                return True
             
             print(f"  no search box found")
             return False
@@ -417,9 +382,24 @@ class PlaywrightMCPBridge:
             print(f"  generic search error: {e}")
             return False
     
+    def _type_search(self, element, search_term: str):
+        # type with per-keystroke delays, or fill in one go when the profile has none
+        typing_delay = self.waits.typing_delay()
+        element.fill('')
+        if typing_delay:
+            print(f"  typing '{search_term}' with {typing_delay}ms delay...")
+            element.type(search_term, delay=typing_delay)
+        else:
+            element.fill(search_term)
+    
+    def _submit_search(self, element):
+        # press enter; search_product then waits for the results
+        element.press('Enter')
+    
     def extract_product_info(self) -> Dict[str, Optional[str]]:
         # extract product information from search results page
         try:
+            self.results_empty = False
             print(f"  extracting product info...")
             current_url = self.page.url.lower()
             
@@ -428,49 +408,11 @@ class PlaywrightMCPBridge:
                 print(f"  ⚠️  still on cloudflare challenge - consider using --show-browser")
                 return {'product_name': None, 'price': None, 'product_url': None}
             
-            # human-like wait for results to render
-            delay = random.uniform(2, 4)
-            time.sleep(delay)
-            
-            # site-specific extraction
-            if 'digikey' in current_url:
-                product_selectors = [
-                    'tr[itemtype*="Product"]',
-                    '.product-details',
-                    '[data-testid="search-result-item"]',
-                    'table.productlist tbody tr'
-                ]
-            elif 'mouser' in current_url:
-                product_selectors = [
-                    '.SearchResultsTableRow',
-                    '.product-item',
-                    'tr.search-result'
-                ]
-            elif 'adafruit' in current_url:
-                product_selectors = [
-                    '.product',
-                    '.product-listing',
-                    'li[class*="product"]'
-                ]
-            elif 'sparkfun' in current_url:
-                product_selectors = [
-                    '.product',
-                    '.product-card',
-                    'li[class*="product"]'
-                ]
-            else:
-                # generic selectors
-                product_selectors = [
-                    '.product',
-                    '.item',
-                    '[data-product]',
-                    '.search-result-item',
-                    '.product-card',
-                    '.product-item',
-                    '[class*="product"]',
-                    'tr[class*="result"]',
-                    'li[class*="product"]'
-                ]
+            # site-specific extraction, once a result row has rendered
+            product_selectors = PRODUCT_SELECTORS[site_key(current_url)]
+            if not self.results_waited:
+                self.waits.results_ready(self.page, product_selectors)
+            self.results_waited = False
             
             product_element = None
             for selector in product_selectors:
@@ -493,11 +435,12 @@ class PlaywrightMCPBridge:
             
             if not product_element:
                 print(f"  no product found")
+                self.results_empty = True
                 return {'product_name': None, 'price': None, 'product_url': None}
             
             # extract product name
             product_name = None
-            name_selectors = ['h2', 'h3', 'h4', '.title', '.name', '[class*="title"]', '[class*="name"]']
+            name_selectors = NAME_SELECTORS
             for selector in name_selectors:
                 try:
                     name_elem = product_element.query_selector(selector)
@@ -510,7 +453,7 @@ class PlaywrightMCPBridge:
             
             # extract price
             price = None
-            price_selectors = ['.price', '[class*="price"]', '[data-price]', 'span:has-text("$")']
+            price_selectors = PRICE_SELECTORS
             for selector in price_selectors:
                 try:
                     price_elem = product_element.query_selector(selector)
@@ -551,40 +494,30 @@ class PlaywrightMCPBridge:
             print(f"  error extracting product info: {e}")
             return {'product_name': None, 'price': None, 'product_url': None}
     
-    def add_to_cart(self, product_url: str = None) -> Dict[str, any]:
-        # navigate to product and add to cart
+    def add_to_cart(self, product_url: str = None, quantity: int = None) -> Dict[str, any]:
+        # navigate to product and add to cart, entering the quantity first when given
         try:
             if product_url:
                 print(f"  navigating to product page...")
                 self.page.goto(product_url, wait_until='domcontentloaded', timeout=30000)
-                time.sleep(2)
             
             print(f"  looking for add to cart button...")
             
-            # try multiple add to cart button selectors
-            cart_button_selectors = [
-                'button:has-text("Add to Cart")',
-                'button:has-text("Add to Basket")',
-                'button:has-text("Add")',
-                '[data-action="add-to-cart"]',
-                '#add-to-cart',
-                '.add-to-cart',
-                'input[value*="Add to Cart"]',
-                'button[name="add-to-cart"]'
-            ]
-            
+            # race every add to cart button selector under one deadline, which also
+            # covers waiting for the product page to render
+            match = race_selectors(self.page, CART_BUTTON_SELECTORS, CART_BUTTON_TIMEOUT_MS)
             button_found = False
-            for selector in cart_button_selectors:
-                try:
-                    button = self.page.wait_for_selector(selector, timeout=2000)
-                    if button and button.is_visible():
-                        button.click()
-                        time.sleep(2)
-                        button_found = True
-                        print(f"  item added to cart!")
-                        break
-                except:
-                    continue
+            if match:
+                _, button = match
+                # the quantity box renders with the button
+                if quantity and quantity > 1:
+                    self._set_quantity(quantity)
+                button.click()
+                # the cart update is an xhr, wait for it to land
+                self.waits.network_quiet(self.page)
+                self.waits.settle()
+                button_found = True
+                print(f"  item added to cart!")
             
             if not button_found:
                 print(f"  could not find add to cart button")
@@ -594,30 +527,9 @@ class PlaywrightMCPBridge:
                     'message': 'Add to cart button not found'
                 }
             
-            # try to get cart url
-            cart_url = None
-            cart_link_selectors = [
-                'a[href*="cart"]',
-                'a[href*="basket"]',
-                '.cart-link',
-                '#cart-link',
-                '[data-testid="cart-link"]'
-            ]
-            
-            for selector in cart_link_selectors:
-                try:
-                    cart_link = self.page.query_selector(selector)
-                    if cart_link:
-                        cart_url = cart_link.get_attribute('href')
-                        if cart_url and not cart_url.startswith('http'):
-                            cart_url = f"{self.page.url.split('/')[0]}//{self.page.url.split('/')[2]}{cart_url}"
-                        break
-                except:
-                    continue
-            
             return {
                 'success': True,
-                'cart_url': cart_url,
+                'cart_url': self.get_cart_url(fallback=False),
                 'message': 'Item added to cart successfully'
             }
             
@@ -629,6 +541,35 @@ class PlaywrightMCPBridge:
                 'message': str(e)
             }
     
+    def _set_quantity(self, quantity: int) -> bool:
+        # type the quantity into the product page's quantity box
+        for selector in QUANTITY_SELECTORS:
+            try:
+                box = self.page.query_selector(selector)
+                if box and box.is_visible():
+                    box.fill(str(quantity))
+                    print(f"  quantity set to {quantity}")
+                    return True
+            except:
+                continue
+        print(f"  no quantity box found, adding 1")
+        return False
+    
+    def get_cart_url(self, fallback: bool = True) -> Optional[str]:
+        # cart link on the current page, or the site's known cart page
+        for selector in CART_LINK_SELECTORS:
+            try:
+                cart_link = self.page.query_selector(selector)
+                if cart_link:
+                    cart_url = cart_link.get_attribute('href')
+                    if cart_url and not cart_url.startswith('http'):
+                        cart_url = f"{self.page.url.split('/')[0]}//{self.page.url.split('/')[2]}{cart_url}"
+                    if cart_url:
+                        return cart_url
+            except:
+                continue
+        return CART_URLS.get(site_key(self.page.url)) if fallback else None
+    
     def get_current_url(self) -> str:
         # get current page url
         if self.page:
@@ -644,8 +585,21 @@ class PlaywrightMCPBridge:
     def close(self):
         # close browser and cleanup
         try:
-            if self.context:
-                self.context.close()
+            for site, (context, page) in self.site_contexts.items():
+                if self.profiles and not page.is_closed():
+                    self.profiles.save(site, context)
+            # self.context is one of the site contexts or the default one from start(), close each once
+            contexts = [context for context, _ in self.site_contexts.values()]
+            for context in (self.default_context, self.context):
+                if context and context not in contexts:
+                    contexts.append(context)
+            for context in contexts:
+                try:
+                    context.close()
+                except:
+                    pass
+            self.site_contexts = {}
+            self.context = self.default_context = None
             if self.browser:
                 self.browser.close()
             if self.playwright:
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+from rate_limiter import TokenBucket
+from url_utils import registrable_domain
+
+
+class DomainPolicy(NamedTuple):
+    rate: float            # requests per second to this domain (0 = unlimited)
+    burst: float           # requests allowed back to back before pacing kicks in
+    max_concurrency: int   # browser tabs working on this domain at once
+
+
+DEFAULT_POLICY = DomainPolicy(
+    rate=float(os.getenv('DOMAIN_RPS', '0.5')),
+    burst=float(os.getenv('DOMAIN_BURST', '2')),
+    max_concurrency=int(os.getenv('DOMAIN_MAX_CONCURRENCY', '1')),
+)
+
+# the big distributors are the most bot-sensitive, keep them slower
+DOMAIN_POLICIES: Dict[str, DomainPolicy] = {
+    'digikey.com': DomainPolicy(rate=0.25, burst=1, max_concurrency=1),
+    'mouser.com': DomainPolicy(rate=0.25, burst=1, max_concurrency=1),
+}
+
+
+def load_policies(path: Optional[str]) -> Dict[str, DomainPolicy]:
+    # per-domain policies, optionally overridden by a json file like
+    # {"default": {"rate": 1}, "adafruit.com": {"rate": 2, "max_concurrency": 2}}
+    policies = dict(DOMAIN_POLICIES)
+    policies['default'] = DEFAULT_POLICY
+    if not path:
+        return policies
+    with open(path) as f:
+        config = json.load(f)
+    for domain, values in config.items():
+        key = domain if domain == 'default' else registrable_domain(domain)
+        base = policies.get(key, policies['default'])
+        policies[key] = base._replace(**{k: v for k, v in values.items() if k in DomainPolicy._fields})
+    return policies
+
+
+def interleave(items: Iterable, key: Callable) -> List:
+    # round-robin items across their keys so no domain gets a long run of consecutive work
+    groups: 'OrderedDict[str, List]' = OrderedDict()
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    result = []
+    while groups:
+        for group_key in list(groups):
+            result.append(groups[group_key].pop(0))
+            if not groups[group_key]:
+                del groups[group_key]
+    return result
+
+
+class DomainStats:
+    def __init__(self):
+        self.requests = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+
+
+class PolitenessScheduler:
+    # per-domain token buckets and concurrency caps shared by every worker in the run
+    def __init__(self, policies: Dict[str, DomainPolicy] = None):
+        self.policies = policies or load_policies(None)
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.slots: Dict[str, threading.Semaphore] = {}
+        self.stats: Dict[str, DomainStats] = {}
+        self.lock = threading.Lock()
+
+    def policy_for(self, domain: str) -> DomainPolicy:
+        return self.policies.get(domain, self.policies['default'])
+
+    def _domain_state(self, domain: str):
+        with self.lock:
+            if domain not in self.buckets:
+                policy = self.policy_for(domain)
+                self.buckets[domain] = TokenBucket(policy.rate, policy.burst)
+                self.slots[domain] = threading.BoundedSemaphore(max(1, policy.max_concurrency))
+                self.stats[domain] = DomainStats()
+            return self.buckets[domain], self.slots[domain], self.stats[domain]
+
+    def acquire(self, url: str) -> float:
+        # block until url's domain has a free slot and a token; returns the time waited
+        bucket, slot, stats = self._domain_state(registrable_domain(url))
+        start = time.monotonic()
+        slot.acquire()
+        bucket.acquire()
+        waited = time.monotonic() - start
+        with self.lock:
+            stats.requests += 1
+            stats.wait_seconds += waited
+            stats.max_wait = max(stats.max_wait, waited)
+        return waited
+
+    def release(self, url: str):
+        _, slot, _ = self._domain_state(registrable_domain(url))
+        slot.release()
+
+    @contextmanager
+    def slot(self, url: str):
+        # hold one of the domain's concurrency slots for the duration of the block
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
+
+    def print_report(self):
+        if not self.stats:
+            return
+        print("per-domain queue wait:")
+        for domain, stats in sorted(self.stats.items()):
+            policy = self.policy_for(domain)
+            avg = stats.wait_seconds / stats.requests if stats.requests else 0.0
+            print(f"  {domain:<20} requests={stats.requests} avg_wait={avg:.1f}s max_wait={stats.max_wait:.1f}s "
+                  f"(rate={policy.rate}/s, max_concurrency={policy.max_concurrency})")
@@ -0,0 +1,107 @@
+import os
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional, Set
+from url_utils import registrable_domain
+
+
+# resource types the scraper never reads
+DEFAULT_BLOCKED_TYPES = {t.strip() for t in os.getenv('BLOCK_RESOURCE_TYPES', 'image,media,font').split(',') if t.strip()}
+
+# analytics, ads, chat widgets and session recorders
+BLOCKED_DOMAINS = {
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'facebook.com', 'connect.facebook.net', 'hotjar.com',
+    'clarity.ms', 'bing.com', 'linkedin.com', 'licdn.com', 'twitter.com', 'tiktok.com', 'pinterest.com',
+    'criteo.com', 'criteo.net', 'taboola.com', 'outbrain.com', 'adroll.com', 'quantserve.com',
+    'scorecardresearch.com', 'newrelic.com', 'nr-data.net', 'optimizely.com', 'demdex.net', 'omtrdc.net',
+    'intercom.io', 'intercomcdn.com', 'zendesk.com', 'zdassets.com', 'livechatinc.com', 'drift.com',
+    'tawk.to', 'olark.com', 'fullstory.com', 'mouseflow.com', 'crazyegg.com', 'segment.io', 'segment.com',
+}
+
+# per-site exceptions where blocking breaks the page
+SITE_OVERRIDES: Dict[str, Dict[str, Set[str]]] = {
+    # cloudflare challenges render their widget from images and check the fonts it loads
+    'digikey.com': {'allow_types': {'image', 'font'}},
+    'mouser.com': {'allow_types': {'font'}},
+}
+
+# rough transfer size of a request we never made, for the bytes-saved estimate
+ESTIMATED_BYTES = {
+    'image': 40_000,
+    'media': 500_000,
+    'font': 60_000,
+    'script': 80_000,
+    'stylesheet': 30_000,
+}
+DEFAULT_ESTIMATED_BYTES = 15_000
+
+
+class ResourceFilter:
+    # aborts requests by resource type and third-party domain before they hit the network
+    # note: playwright turns off the http cache for routed contexts, which blocking more than repays
+    def __init__(self, blocked_types: Optional[Iterable[str]] = None, blocked_domains: Optional[Iterable[str]] = None,
+                 overrides: Dict[str, Dict[str, Set[str]]] = None):
+        self.blocked_types = set(DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.blocked_domains = set(BLOCKED_DOMAINS if blocked_domains is None else blocked_domains)
+        self.overrides = SITE_OVERRIDES if overrides is None else overrides
+        self.lock = threading.Lock()
+        self.allowed = 0
+        self.blocked = Counter()
+        self.bytes_saved = 0
+
+    def should_block(self, url: str, resource_type: str, site: str) -> bool:
+        # site is the registrable domain of the supplier the page belongs to
+        if not url.startswith('http'):
+            return False
+        override = self.overrides.get(site, {})
+        domain = registrable_domain(url)
+        if domain != site and domain in self.blocked_domains and domain not in override.get('allow_domains', ()):
+            return True
+        return resource_type in self.blocked_types and resource_type not in override.get('allow_types', ())
+
+    def _record(self, blocked: bool, resource_type: str):
+        with self.lock:
+            if blocked:
+                self.blocked[resource_type] += 1
+                self.bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+            else:
+                self.allowed += 1
+
+    def install(self, context, site_url: Optional[str]):
+        # route every request of a sync playwright context through the filter
+        site = registrable_domain(site_url) if site_url else ''
+
+        def handle(route):
+            request = route.request
+            blocked = self.should_block(request.url, request.resource_type, site)
+            self._record(blocked, request.resource_type)
+            if blocked:
+                route.abort()
+            else:
+                route.continue_()
+
+        context.route('**/*', handle)
+
+    async def install_async(self, context, site_url: Optional[str]):
+        # same as install() for async playwright contexts
+        site = registrable_domain(site_url) if site_url else ''
+
+        async def handle(route):
+            request = route.request
+            blocked = self.should_block(request.url, request.resource_type, site)
+            self._record(blocked, request.resource_type)
+            if blocked:
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route('**/*', handle)
+
+    def print_report(self):
+        total_blocked = sum(self.blocked.values())
+        if not total_blocked and not self.allowed:
+            return
+        by_type = ', '.join(f"{rtype}={count}" for rtype, count in self.blocked.most_common())
+        print(f"blocked requests: {total_blocked} of {total_blocked + self.allowed} ({by_type or 'none'}), "
+              f"~{self.bytes_saved / 1_000_000:.1f} MB saved")
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional
+from url_utils import registrable_domain
+
+
+DEFAULT_CACHE_PATH = os.getenv('SEARCH_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.search_cache.sqlite'))
+DEFAULT_TTL_HOURS = float(os.getenv('SEARCH_CACHE_TTL_HOURS', '24'))
+# misses expire sooner, suppliers add stock and our selectors get fixed
+DEFAULT_MISS_TTL_HOURS = float(os.getenv('NEGATIVE_CACHE_TTL_HOURS', '6'))
+
+
+def normalize_query(part_name: str) -> str:
+    # "10K  Resistor, 0603" and "10k resistor 0603" are the same search
+    return re.sub(r'[\s,;]+', ' ', part_name.lower()).strip()
+
+
+class SearchCache:
+    # (supplier domain, part query) -> product found there, persisted across runs in sqlite
+    def __init__(self, path: str = None, ttl_hours: float = None, refresh: bool = False):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttl_seconds = (DEFAULT_TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+        # refresh ignores existing entries but still stores the new results
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        # pool workers share this connection, the lock serializes access
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS search_results ('
+            ' site TEXT NOT NULL, query TEXT NOT NULL, product_name TEXT, price TEXT, product_url TEXT,'
+            ' fetched_at REAL NOT NULL, PRIMARY KEY (site, query))'
+        )
+        self.conn.commit()
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def get(self, website_url: str, part_name: str) -> Optional[Dict[str, Optional[str]]]:
+        # fresh cached product for this part on this site, or None
+        site = registrable_domain(website_url)
+        row = None
+        with self.lock:
+            if not self.refresh:
+                row = self.conn.execute(
+                    'SELECT product_name, price, product_url FROM search_results'
+                    ' WHERE site = ? AND query = ? AND fetched_at >= ?',
+                    (site, normalize_query(part_name), time.time() - self.ttl_seconds)
+                ).fetchone()
+            if row is None:
+                self.misses[site] += 1
+                return None
+            self.hits[site] += 1
+        return {'product_name': row[0], 'price': row[1], 'product_url': row[2]}
+
+    def put(self, website_url: str, part_name: str, product_info: Dict[str, Optional[str]]):
+        # only found products are cached; a miss may just have been a flaky page
+        if not product_info.get('product_url'):
+            return
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?, ?)',
+                (registrable_domain(website_url), normalize_query(part_name), product_info.get('product_name'),
+                 product_info.get('price'), product_info['product_url'], time.time())
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def print_report(self):
+        sites = sorted(set(self.hits) | set(self.misses))
+        if not sites:
+            return
+        print("search cache hit rate:")
+        for site in sites:
+            lookups = self.hits[site] + self.misses[site]
+            print(f"  {site:<20} {self.hits[site]}/{lookups} ({self.hits[site] / lookups:.0%})")
+
+
+class BloomFilter:
+    # fixed-size bit set; "not in" is always right, "in" is wrong about 1% of the time
+    def __init__(self, capacity: int = 10000, hashes: int = 7):
+        self.size = capacity * 10
+        self.hashes = hashes
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class NegativeCache:
+    # (supplier domain, part query) pairs whose search came back empty, with the time that search took
+    # a bloom filter answers most lookups without touching sqlite, since most pairs are not misses
+    def __init__(self, path: str = None, ttl_hours: float = None, refresh: bool = False):
+        self.path = path or DEFAULT_CACHE_PATH
+        self.ttl_seconds = (DEFAULT_MISS_TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS search_misses ('
+            ' site TEXT NOT NULL, query TEXT NOT NULL, seconds REAL NOT NULL, checked_at REAL NOT NULL,'
+            ' PRIMARY KEY (site, query))'
+        )
+        self.conn.execute('DELETE FROM search_misses WHERE checked_at < ?', (time.time() - self.ttl_seconds,))
+        self.conn.commit()
+        self.bloom = BloomFilter()
+        if not refresh:
+            for site, query in self.conn.execute('SELECT site, query FROM search_misses'):
+                self.bloom.add(f"{site}|{query}")
+        self.skipped = defaultdict(int)
+        self.seconds_saved = 0.0
+
+    def is_known_miss(self, website_url: str, part_name: str) -> bool:
+        # true if this site came back empty for this part within the ttl
+        site, query = registrable_domain(website_url), normalize_query(part_name)
+        if self.refresh or f"{site}|{query}" not in self.bloom:
+            return False
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT seconds FROM search_misses WHERE site = ? AND query = ? AND checked_at >= ?',
+                (site, query, time.time() - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return False
+            self.skipped[site] += 1
+            self.seconds_saved += row[0]
+        return True
+
+    def put(self, website_url: str, part_name: str, seconds: float):
+        site, query = registrable_domain(website_url), normalize_query(part_name)
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO search_misses VALUES (?, ?, ?, ?)',
+                              (site, query, seconds, time.time()))
+            self.conn.commit()
+            self.bloom.add(f"{site}|{query}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def print_report(self):
+        if not self.skipped:
+            return
+        skipped = ', '.join(f"{site}={count}" for site, count in sorted(self.skipped.items()))
+        print(f"known misses skipped: {sum(self.skipped.values())} ({skipped}), ~{self.seconds_saved:.0f}s saved")
@@ -0,0 +1,91 @@
+import re
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional
+
+
+EXHAUSTIVE = 'exhaustive'  # search every website (the original behaviour)
+FIRST = 'first'            # stop at the first acceptable match
+BEST_PRICE = 'best-price'  # keep searching until the time budget runs out, then take the cheapest
+STRATEGIES = (EXHAUSTIVE, FIRST, BEST_PRICE)
+
+_PRICE = re.compile(r'\d[\d,]*\.?\d*')
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def parse_price(price: Optional[str]) -> Optional[float]:
+    # "$1,234.50" -> 1234.5; None when there is no number
+    if not price:
+        return None
+    match = _PRICE.search(str(price))
+    if not match:
+        return None
+    try:
+        return float(match.group().replace(',', ''))
+    except ValueError:
+        return None
+
+
+def name_similarity(part_name: str, product_name: Optional[str]) -> float:
+    # 0..1, the better of token overlap (how much of the part is in the product name)
+    # and character similarity, so "10k resistor" matches "RES 10K OHM 1% 0603 resistor"
+    if not product_name:
+        return 0.0
+    part_tokens = set(_TOKEN.findall(part_name.lower()))
+    product_tokens = set(_TOKEN.findall(product_name.lower()))
+    overlap = len(part_tokens & product_tokens) / len(part_tokens) if part_tokens else 0.0
+    ratio = SequenceMatcher(None, part_name.lower(), product_name.lower()).ratio()
+    return max(overlap, ratio)
+
+
+class SearchStrategy:
+    # decides when a part's remaining website searches can be cancelled, and which result to buy
+    def __init__(self, name: str = EXHAUSTIVE, time_budget: float = 60.0, min_similarity: float = 0.5):
+        if name not in STRATEGIES:
+            raise ValueError(f"unknown search strategy {name!r}, expected one of {', '.join(STRATEGIES)}")
+        self.name = name
+        self.time_budget = time_budget
+        self.min_similarity = min_similarity
+        self.sites_total = 0
+        self.sites_visited = 0
+        self.parts = 0
+        self.lock = threading.Lock()
+
+    @property
+    def exhaustive(self) -> bool:
+        return self.name == EXHAUSTIVE
+
+    def is_acceptable(self, part_name: str, info: Dict) -> bool:
+        # a product we'd be happy to buy: has a link, a price and a name close to the part
+        return (bool(info.get('product_url')) and parse_price(info.get('price')) is not None
+                and name_similarity(part_name, info.get('product_name')) >= self.min_similarity)
+
+    def is_satisfied(self, part_name: str, results: List[Dict], started: float) -> bool:
+        # True once the remaining websites for this part don't need to be searched
+        if self.name == FIRST:
+            return any(self.is_acceptable(part_name, info) for info in results)
+        if self.name == BEST_PRICE:
+            return time.monotonic() - started >= self.time_budget
+        return False
+
+    def choose(self, part_name: str, results: List[Dict]) -> Optional[Dict]:
+        # the result to add to the cart; None means nothing acceptable was found
+        acceptable = [info for info in results if self.is_acceptable(part_name, info)]
+        if not acceptable:
+            return None
+        if self.name == BEST_PRICE:
+            return min(acceptable, key=lambda info: parse_price(info['price']))
+        return acceptable[0]
+
+    def record(self, sites_total: int, sites_visited: int):
+        with self.lock:
+            self.parts += 1
+            self.sites_total += sites_total
+            self.sites_visited += sites_visited
+
+    def print_report(self):
+        if self.exhaustive or not self.parts:
+            return
+        print(f"search strategy {self.name}: {self.sites_visited}/{self.sites_total} site searches run, "
+              f"{self.sites_visited / self.parts:.1f} per part")
@@ -0,0 +1,48 @@
+from typing import List, Optional, Tuple
+
+
+# one deadline for a whole candidate list, instead of a timeout per candidate
+SEARCH_BOX_TIMEOUT_MS = 5000
+# also covers the product page rendering after navigation, there is no separate wait for it
+CART_BUTTON_TIMEOUT_MS = 8000
+
+
+def any_of(selectors: List[str]) -> str:
+    # one selector matching whichever candidate shows up visible first; without the :visible
+    # filter wait_for_selector checks only the first match in dom order, so a hidden header
+    # matching a broad candidate would hold up the wait until it timed out
+    return ', '.join(f'{selector}:visible' for selector in selectors)
+
+
+def race_selectors(page, selectors: List[str], timeout_ms: float) -> Optional[Tuple[str, object]]:
+    # wait for any candidate to become visible, then return (selector, element) for the
+    # first visible one in list order, so more specific selectors still win ties
+    # returns None once the deadline passes with nothing visible
+    try:
+        page.wait_for_selector(any_of(selectors), state='visible', timeout=timeout_ms)
+    except Exception:
+        return None
+    for selector in selectors:
+        try:
+            for element in page.query_selector_all(selector):
+                if element.is_visible():
+                    return selector, element
+        except Exception:
+            continue
+    return None
+
+
+async def race_selectors_async(page, selectors: List[str], timeout_ms: float) -> Optional[Tuple[str, object]]:
+    # race_selectors for async playwright pages
+    try:
+        await page.wait_for_selector(any_of(selectors), state='visible', timeout=timeout_ms)
+    except Exception:
+        return None
+    for selector in selectors:
+        try:
+            for element in await page.query_selector_all(selector):
+                if await element.is_visible():
+                    return selector, element
+        except Exception:
+            continue
+    return None
@@ -0,0 +1,173 @@
+# selectors and page markers shared by the sync and async playwright bridges
+from typing import Optional
+from urllib.parse import quote_plus
+
+
+# text that shows up on cloudflare challenge pages
+CLOUDFLARE_INDICATORS = [
+    'cloudflare',
+    'checking your browser',
+    'just a moment',
+    'ddos protection',
+    'ray id'
+]
+
+# common cookie banner and popup close buttons
+POPUP_SELECTORS = [
+    'button:has-text("Accept")',
+    'button:has-text("Accept All")',
+    'button:has-text("I Agree")',
+    'button:has-text("OK")',
+    'button:has-text("Close")',
+    '[aria-label="Close"]',
+    '.close-button',
+    '#onetrust-accept-btn-handler',  # common cookie consent
+    '.cookie-accept',
+    '[class*="cookie"] button',
+    '[id*="cookie"] button'
+]
+
+# search box candidates per site
+SEARCH_SELECTORS = {
+    # digikey uses multiple possible selectors
+    'digikey': [
+        '#searchInput',
+        'input[data-testid="search-input"]',
+        'input[id="searchInput"]',
+        'input[name="keywords"]',
+        'input[placeholder*="Part Number" i]',
+        'input[type="text"][class*="search"]',
+        '#searchform input',
+        'header input[type="text"]'
+    ],
+    'mouser': [
+        'input[name="keyword"]',
+        '#searchInput',
+        'input[placeholder*="Search"]'
+    ],
+    'adafruit': [
+        'input[name="q"]',
+        '#search_query_top',
+        'input[type="search"]'
+    ],
+    'sparkfun': [
+        'input[name="q"]',
+        '#search-input',
+        'input[type="search"]'
+    ],
+    'generic': [
+        'input[type="search"]',
+        'input[name="search"]',
+        'input[name="q"]',
+        'input[id*="search" i]',
+        'input[placeholder*="Search" i]',
+        '#search-input',
+        '.search-input',
+        '[data-testid="search-input"]',
+        'input[aria-label*="Search" i]'
+    ],
+}
+
+# search result product candidates per site
+PRODUCT_SELECTORS = {
+    'digikey': [
+        'tr[itemtype*="Product"]',
+        '.product-details',
+        '[data-testid="search-result-item"]',
+        'table.productlist tbody tr'
+    ],
+    'mouser': [
+        '.SearchResultsTableRow',
+        '.product-item',
+        'tr.search-result'
+    ],
+    'adafruit': [
+        '.product',
+        '.product-listing',
+        'li[class*="product"]'
+    ],
+    'sparkfun': [
+        '.product',
+        '.product-card',
+        'li[class*="product"]'
+    ],
+    'generic': [
+        '.product',
+        '.item',
+        '[data-product]',
+        '.search-result-item',
+        '.product-card',
+        '.product-item',
+        '[class*="product"]',
+        'tr[class*="result"]',
+        'li[class*="product"]'
+    ],
+}
+
+# fields inside a product result
+NAME_SELECTORS = ['h2', 'h3', 'h4', '.title', '.name', '[class*="title"]', '[class*="name"]']
+PRICE_SELECTORS = ['.price', '[class*="price"]', '[data-price]', 'span:has-text("$")']
+
+CART_BUTTON_SELECTORS = [
+    'button:has-text("Add to Cart")',
+    'button:has-text("Add to Basket")',
+    'button:has-text("Add")',
+    '[data-action="add-to-cart"]',
+    '#add-to-cart',
+    '.add-to-cart',
+    'input[value*="Add to Cart"]',
+    'button[name="add-to-cart"]'
+]
+
+CART_LINK_SELECTORS = [
+    'a[href*="cart"]',
+    'a[href*="basket"]',
+    '.cart-link',
+    '#cart-link',
+    '[data-testid="cart-link"]'
+]
+
+# quantity box on product pages
+QUANTITY_SELECTORS = [
+    'input[name*="qty" i]',
+    'input[id*="qty" i]',
+    'input[name*="quantity" i]',
+    'input[id*="quantity" i]',
+    'input[aria-label*="quantity" i]',
+    'input[type="number"]'
+]
+
+# cart pages, for when the product page has no cart link
+CART_URLS = {
+    'digikey': 'https://www.digikey.com/ordering/shoppingcart',
+    'mouser': 'https://www.mouser.com/Cart/',
+    'adafruit': 'https://www.adafruit.com/shopping_cart',
+    'sparkfun': 'https://www.sparkfun.com/cart',
+}
+
+KNOWN_SITES = ['digikey', 'mouser', 'adafruit', 'sparkfun']
+
+# keyword results pages, so known sites can be searched in one navigation
+SEARCH_URL_TEMPLATES = {
+    'digikey': 'https://www.digikey.com/en/products/result?keywords={query}',
+    'mouser': 'https://www.mouser.com/c/?q={query}',
+    'adafruit': 'https://www.adafruit.com/search?q={query}',
+    'sparkfun': 'https://www.sparkfun.com/search/results?term={query}',
+}
+
+
+def site_key(url: str) -> str:
+    # which selector set applies to a url
+    url = (url or '').lower()
+    for site in KNOWN_SITES:
+        if site in url:
+            return site
+    return 'generic'
+
+
+def search_url(url: str, search_term: str) -> Optional[str]:
+    # results page for search_term on url's site, or None if the site has no template
+    template = SEARCH_URL_TEMPLATES.get(site_key(url))
+    if template is None:
+        return None
+    return template.format(query=quote_plus(search_term.strip()))
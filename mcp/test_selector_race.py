@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+
+import asyncio
+from selector_race import any_of, race_selectors, race_selectors_async
+
+
+class FakeElement:
+    def __init__(self, selector, visible):
+        self.selector = selector
+        self.visible = visible
+
+    def is_visible(self):
+        return self.visible
+
+
+class FakePage:
+    """
+    page with elements in dom order, each matched by one plain selector
+    wait_for_selector behaves like playwright's: it checks only the first element
+    in dom order matching the whole selector list, where a trailing :visible
+    makes a candidate skip hidden elements
+    """
+    def __init__(self, elements):
+        self.elements = elements
+
+    def _matches(self, element, candidate):
+        if candidate.endswith(':visible'):
+            return element.visible and element.selector == candidate[:-len(':visible')]
+        return element.selector == candidate
+
+    def wait_for_selector(self, selector, state='visible', timeout=0):
+        candidates = [c.strip() for c in selector.split(',')]
+        first = next((e for e in self.elements if any(self._matches(e, c) for c in candidates)), None)
+        if first is None or (state == 'visible' and not first.visible):
+            raise TimeoutError(f"waiting for {selector} timed out")
+        return first
+
+    def query_selector_all(self, selector):
+        return [e for e in self.elements if e.selector == selector]
+
+
+class FakeAsyncElement(FakeElement):
+    async def is_visible(self):
+        return self.visible
+
+
+class FakeAsyncPage(FakePage):
+    async def wait_for_selector(self, selector, state='visible', timeout=0):
+        return FakePage.wait_for_selector(self, selector, state, timeout)
+
+    async def query_selector_all(self, selector):
+        return FakePage.query_selector_all(self, selector)
+
+
+def test_any_of_filters_visible():
+    assert any_of(['#search', '.item']) == '#search:visible, .item:visible'
+
+
+def test_hidden_first_match_does_not_block_visible_candidate():
+    # a hidden mobile search box comes first in the dom, the desktop one is visible
+    page = FakePage([FakeElement('input[type="search"]', False), FakeElement('#search-input', True)])
+    match = race_selectors(page, ['input[type="search"]', '#search-input'], 1000)
+    assert match is not None
+    selector, element = match
+    assert selector == '#search-input'
+    assert element.visible
+
+
+def test_list_order_wins_between_visible_candidates():
+    page = FakePage([FakeElement('.generic', True), FakeElement('#specific', True)])
+    selector, _ = race_selectors(page, ['#specific', '.generic'], 1000)
+    assert selector == '#specific'
+
+
+def test_nothing_visible_returns_none():
+    page = FakePage([FakeElement('#search-input', False)])
+    assert race_selectors(page, ['#search-input', '.missing'], 1000) is None
+
+
+def test_async_hidden_first_match():
+    page = FakeAsyncPage([FakeAsyncElement('input[type="search"]', False), FakeAsyncElement('#search-input', True)])
+    match = asyncio.run(race_selectors_async(page, ['input[type="search"]', '#search-input'], 1000))
+    assert match is not None and match[0] == '#search-input'
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✓ {name}")
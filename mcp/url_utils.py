@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, List, NamedTuple
+from urllib.parse import urlsplit
+
+
+# second-level public suffixes we see on supplier sites (enough for registrable-domain purposes)
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'com.au', 'net.au', 'co.jp', 'com.cn', 'com.br', 'co.in', 'co.nz', 'com.mx', 'co.kr', 'com.sg',
+}
+
+# registrable domain -> page the browser should open to search that supplier
+KNOWN_SUPPLIERS: Dict[str, str] = {
+    'digikey.com': 'https://www.digikey.com/',
+    'mouser.com': 'https://www.mouser.com/',
+    'newark.com': 'https://www.newark.com/',
+    'arrow.com': 'https://www.arrow.com/',
+    'adafruit.com': 'https://www.adafruit.com/',
+    'sparkfun.com': 'https://www.sparkfun.com/',
+    'mcmaster.com': 'https://www.mcmaster.com/',
+    'pololu.com': 'https://www.pololu.com/',
+    'lcsc.com': 'https://www.lcsc.com/',
+    'amazon.com': 'https://www.amazon.com/',
+}
+
+
+def _split(url: str):
+    # urlsplit only finds the host when a scheme is present
+    url = url.strip().strip('<>"\'')
+    if '://' not in url:
+        url = 'https://' + url
+    return urlsplit(url)
+
+
+def registrable_domain(url: str) -> str:
+    # "https://www.digikey.com/en" and "shop.digikey.com" both give "digikey.com"
+    host = (_split(url).hostname or '').lower().rstrip('.')
+    labels = host.split('.')
+    if len(labels) >= 3 and '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def canonicalize_url(url: str) -> str:
+    # known suppliers map to their search entry point, anything else to its homepage
+    domain = registrable_domain(url)
+    if domain in KNOWN_SUPPLIERS:
+        return KNOWN_SUPPLIERS[domain]
+    host = (_split(url).hostname or domain).lower()
+    return f"https://{host}/"
+
+
+def dedupe_websites(urls: Iterable[str]) -> List[str]:
+    # canonical urls with one entry per supplier, keeping the first-seen order
+    seen = set()
+    result = []
+    for url in urls:
+        domain = registrable_domain(url)
+        if not domain or domain in seen:
+            continue
+        seen.add(domain)
+        result.append(canonicalize_url(url))
+    return result
+
+
+class SupplierPlan(NamedTuple):
+    websites: Dict[str, List[str]]       # part -> canonical, deduped websites
+    parts_by_supplier: Dict[str, List[str]]  # canonical website -> parts to search there
+    raw_visits: int                      # (part, website) pairs before deduplication
+    visits: int                          # (part, website) pairs after deduplication
+
+    @property
+    def duplicate_visits_removed(self) -> int:
+        return self.raw_visits - self.visits
+
+    @property
+    def homepage_loads_avoided(self) -> int:
+        # with one browser session per supplier each homepage is loaded once
+        return self.raw_visits - len(self.parts_by_supplier)
+
+
+def plan_suppliers(websites_map: Dict[str, List[str]]) -> SupplierPlan:
+    # dedupe sites within each part and group parts by supplier across the whole bom
+    websites = {}
+    parts_by_supplier: Dict[str, List[str]] = {}
+    raw_visits = 0
+    for part, urls in websites_map.items():
+        raw_visits += len(urls)
+        websites[part] = dedupe_websites(urls)
+        for site in websites[part]:
+            parts_by_supplier.setdefault(site, []).append(part)
+    visits = sum(len(sites) for sites in websites.values())
+    return SupplierPlan(websites, parts_by_supplier, raw_visits, visits)
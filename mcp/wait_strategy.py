@@ -0,0 +1,129 @@
+import asyncio
+import os
+import random
+import time
+from typing import List, NamedTuple, Tuple
+from selector_race import any_of
+from site_selectors import CLOUDFLARE_INDICATORS
+
+
+class PacingProfile(NamedTuple):
+    settle: Tuple[float, float]       # seconds to linger once a page is ready
+    think: Tuple[float, float]        # seconds before clicking or typing into a control
+    typing_ms: Tuple[int, int]        # per-keystroke delay; (0, 0) fills the box in one go
+    results_timeout: float            # seconds to wait for a results container or url change
+    network_quiet_timeout: float      # seconds to wait for the network to go idle
+    challenge_timeout: float          # seconds to wait for a cloudflare challenge to clear
+
+
+PACING_PROFILES = {
+    # the old fixed sleeps, for sites that flag anything faster
+    'human': PacingProfile(settle=(2.0, 5.0), think=(0.5, 1.5), typing_ms=(100, 250),
+                           results_timeout=8.0, network_quiet_timeout=10.0, challenge_timeout=15.0),
+    'balanced': PacingProfile(settle=(0.3, 0.8), think=(0.1, 0.3), typing_ms=(30, 80),
+                              results_timeout=5.0, network_quiet_timeout=3.0, challenge_timeout=15.0),
+    'fast': PacingProfile(settle=(0.0, 0.0), think=(0.0, 0.0), typing_ms=(0, 0),
+                          results_timeout=4.0, network_quiet_timeout=1.5, challenge_timeout=10.0),
+}
+DEFAULT_PACING = os.getenv('PACING_PROFILE', 'balanced')
+
+# true once the page no longer looks like a cloudflare challenge
+_CHALLENGE_CLEARED_JS = """indicators => {
+    const text = ((document.title || '') + ' ' + (document.body ? document.body.innerText.slice(0, 2000) : '')).toLowerCase();
+    return !indicators.some(i => text.includes(i));
+}"""
+
+
+def get_profile(name: str = None) -> PacingProfile:
+    name = name or DEFAULT_PACING
+    if name not in PACING_PROFILES:
+        raise ValueError(f"unknown pacing profile {name!r}, expected one of {', '.join(PACING_PROFILES)}")
+    return PACING_PROFILES[name]
+
+
+class PageWaits:
+    # event-driven waits for the sync bridge: wait for what we need to see, with tight timeouts,
+    # and only sleep for the pacing profile's small random pauses
+    def __init__(self, profile: PacingProfile):
+        self.profile = profile
+
+    @staticmethod
+    def _span(bounds: Tuple[float, float]) -> float:
+        return random.uniform(*bounds) if bounds[1] > 0 else 0.0
+
+    def typing_delay(self) -> int:
+        return random.randint(*self.profile.typing_ms) if self.profile.typing_ms[1] > 0 else 0
+
+    def settle(self):
+        delay = self._span(self.profile.settle)
+        if delay:
+            time.sleep(delay)
+
+    def think(self):
+        delay = self._span(self.profile.think)
+        if delay:
+            time.sleep(delay)
+
+    def network_quiet(self, page) -> bool:
+        try:
+            page.wait_for_load_state('networkidle', timeout=self.profile.network_quiet_timeout * 1000)
+            return True
+        except Exception:
+            return False  # long-polling pages never go idle, carry on
+
+    def challenge_cleared(self, page) -> bool:
+        try:
+            page.wait_for_function(_CHALLENGE_CLEARED_JS, arg=CLOUDFLARE_INDICATORS,
+                                   timeout=self.profile.challenge_timeout * 1000)
+            return True
+        except Exception:
+            return False
+
+    def results_ready(self, page, selectors: List[str], previous_url: str = None) -> bool:
+        # a results container is visible; failing that, the url moved on and the network went quiet
+        try:
+            page.wait_for_selector(any_of(selectors), state='visible', timeout=self.profile.results_timeout * 1000)
+            return True
+        except Exception:
+            pass
+        if previous_url is not None and page.url != previous_url:
+            self.network_quiet(page)
+        return False
+
+
+class AsyncPageWaits(PageWaits):
+    # the same waits for async playwright pages
+    async def settle(self):
+        delay = self._span(self.profile.settle)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def think(self):
+        delay = self._span(self.profile.think)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def network_quiet(self, page) -> bool:
+        try:
+            await page.wait_for_load_state('networkidle', timeout=self.profile.network_quiet_timeout * 1000)
+            return True
+        except Exception:
+            return False
+
+    async def challenge_cleared(self, page) -> bool:
+        try:
+            await page.wait_for_function(_CHALLENGE_CLEARED_JS, arg=CLOUDFLARE_INDICATORS,
+                                         timeout=self.profile.challenge_timeout * 1000)
+            return True
+        except Exception:
+            return False
+
+    async def results_ready(self, page, selectors: List[str], previous_url: str = None) -> bool:
+        try:
+            await page.wait_for_selector(any_of(selectors), state='visible', timeout=self.profile.results_timeout * 1000)
+            return True
+        except Exception:
+            pass
+        if previous_url is not None and page.url != previous_url:
+            await self.network_quiet(page)
+        return False
@@ -1,46 +1,138 @@
 import os
+import re
+import time
+import random
 import google.generativeai as genai
-from typing import List, Dict
+from google.api_core import exceptions as google_exceptions
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterable, Tuple
+from rate_limiter import TokenBucket
+from part_classifier import PartClassifier
+from url_utils import dedupe_websites
+
+
+FALLBACK_WEBSITES = ["https://www.adafruit.com/"]
+
+# first url-looking token on a line, e.g. in "1. https://www.digikey.com/ - Digikey"
+URL_PATTERN = re.compile(r'(https?://[^\s<>"\')\]]+|www\.[^\s<>"\')\]]+)', re.IGNORECASE)
+
+# errors worth retrying: throttling, timeouts and flaky connections
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+    ConnectionError,
+    TimeoutError,
+)
 
 
 class WebsiteFinder:
-    def __init__(self, api_key: str = None, num_websites: int = 3):
+    def __init__(self, api_key: str = None, num_websites: int = 3, max_workers: int = 1,
+                 requests_per_second: float = 1.0, max_retries: int = 3, use_classifier: bool = True):
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         self.num_websites = num_websites
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        # shared across all workers so concurrency never exceeds the gemini quota
+        self.rate_limiter = TokenBucket(requests_per_second, capacity=max(1.0, requests_per_second * 2))
+        # per-part discovery latency in seconds
+        self.latencies: Dict[str, float] = {}
+        # local category routing; gemini is only asked when it is unsure
+        self.classifier = PartClassifier() if use_classifier else None
+        # per-part source of the website list: 'classifier' or 'gemini'
+        self.sources: Dict[str, str] = {}
         genai.configure(api_key=self.api_key)
         self.model = genai.GenerativeModel('gemini-pro')
-        
-    def find_websites_for_part(self, part_name: str) -> List[str]:
+
+    def _query_websites(self, part_name: str) -> List[str]:
         # use gemini to find relevant supplier websites for a specific part
         prompt = f"""Find {self.num_websites} reputable websites where I can purchase the following electronic/mechanical part: {part_name}
-        
+
         Return ONLY a list of website URLs, one per line, without any additional text or explanation.
         Focus on well-known suppliers like Digikey, Mouser, Newark, Arrow, Adafruit, SparkFun, McMaster-Carr, etc.
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            # parse the response to extract urls
-            websites = []
-            for line in response.text.strip().split('\n'):
-                line = line.strip()
-                if line and ('http://' in line or 'https://' in line or line.startswith('www.')):
-                    # clean up the url
-                    if not line.startswith('http'):
-                        line = 'https://' + line
-                    websites.append(line)
-            
-            return websites[:self.num_websites]
-        except Exception as e:
-            print(f"error finding websites for {part_name}: {e}")
-            return ["https://www.adafruit.com/"] # fallback to adafruit
-    
-    def find_websites_for_parts(self, parts: List[str]) -> Dict[str, List[str]]:
+
+        self.rate_limiter.acquire()
+        response = self.model.generate_content(prompt)
+        # parse the response to extract urls
+        websites = []
+        for line in response.text.strip().split('\n'):
+            match = URL_PATTERN.search(line)
+            if match:
+                websites.append(match.group(1))
+
+        # canonical supplier entry points, one per supplier
+        return dedupe_websites(websites)[:self.num_websites]
+
+    def _find_with_retries(self, part_name: str) -> Tuple[List[str], int]:
+        # retry transient errors with backoff; anything else goes straight to the fallback
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return self._query_websites(part_name), attempt
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.max_retries:
+                    print(f"error finding websites for {part_name} after {attempt} attempts: {e}")
+                    break
+                backoff = min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+                print(f"transient error for {part_name} ({type(e).__name__}), retrying in {backoff:.1f}s")
+                time.sleep(backoff)
+            except Exception as e:
+                print(f"error finding websites for {part_name}: {e}")
+                return list(FALLBACK_WEBSITES), attempt
+        return list(FALLBACK_WEBSITES), self.max_retries
+
+    def _route_locally(self, part_name: str):
+        # supplier list from the category routing table, or None when the classifier is unsure
+        if self.classifier is None:
+            return None
+        result = self.classifier.classify(part_name)
+        if not self.classifier.is_confident(result):
+            return None
+        return result.suppliers[:self.num_websites]
+
+    def find_websites_for_part(self, part_name: str) -> List[str]:
+        # find supplier websites for one part, recording how long it took
+        start = time.perf_counter()
+        websites = self._route_locally(part_name)
+        if websites:
+            self.sources[part_name] = 'classifier'
+            attempts = 0
+        else:
+            self.sources[part_name] = 'gemini'
+            websites, attempts = self._find_with_retries(part_name)
+        elapsed = time.perf_counter() - start
+        self.latencies[part_name] = elapsed
+        if self.max_workers > 1:
+            retries = f", {attempts} attempts" if attempts > 1 else ""
+            print(f"found {len(websites)} websites for: {part_name} ({elapsed:.2f}s{retries})")
+        return websites
+
+    def find_websites_for_parts(self, parts: Iterable[str]) -> Dict[str, List[str]]:
         # find relevant websites for all parts in the bom
         results = {}
-        for part in parts:
-            print(f"finding websites for: {part}")
-            results[part] = self.find_websites_for_part(part)
+        start = time.perf_counter()
+        if self.max_workers == 1:
+            for part in parts:
+                print(f"finding websites for: {part}")
+                results[part] = self.find_websites_for_part(part)
+        else:
+            # executor.map keeps the bom order in the results
+            parts = list(parts)
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='discovery') as executor:
+                for part, websites in zip(parts, executor.map(self.find_websites_for_part, parts)):
+                    results[part] = websites
+        self._print_latency_summary(time.perf_counter() - start)
         return results
 
-
+    def _print_latency_summary(self, wall_time: float):
+        # report per-part latency percentiles against the wall-clock time
+        if not self.latencies:
+            return
+        latencies = sorted(self.latencies.values())
+        p50 = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        routed = sum(1 for source in self.sources.values() if source == 'classifier')
+        print(f"discovery: {len(latencies)} parts in {wall_time:.1f}s with {self.max_workers} workers "
+              f"(per part p50={p50:.2f}s p95={p95:.2f}s max={latencies[-1]:.2f}s)")
+        print(f"discovery: {routed} parts routed by category, {len(self.sources) - routed} asked gemini")
@@ -7,8 +7,14 @@ import time
 import sys
 import os
 import signal
+import json
+import urllib.request
+import urllib.error
 from pathlib import Path
 
+BACKEND_URL = 'http://localhost:5000'
+READY_TIMEOUT = 180  # seconds to wait for the backend warm-up
+
 # Colors for terminal output
 class Colors:
     GREEN = '\033[0;32m'
@@ -53,6 +59,48 @@ def install_frontend_deps():
         print_colored("📦 Installing frontend dependencies...", Colors.BLUE)
         subprocess.run(['pnpm', 'install'], cwd=str(frontend_path))
 
+def wait_for_backend(backend_process, timeout=READY_TIMEOUT):
+    """Poll /ready until the backend has warmed up, printing each dependency as it finishes"""
+    deadline = time.time() + timeout
+    reported = set()
+    
+    while time.time() < deadline:
+        if backend_process.poll() is not None:
+            return False
+        
+        try:
+            with urllib.request.urlopen(f'{BACKEND_URL}/ready', timeout=2) as response:
+                body = json.load(response)
+        except urllib.error.HTTPError as e:
+            # 503 means the server is up but still warming
+            body = json.load(e) if e.code == 503 else None
+        except Exception:
+            body = None  # server not listening yet
+        
+        if body:
+            for name, state in body.get('dependencies', {}).items():
+                if name in reported or state['status'] not in ('ready', 'failed'):
+                    continue
+                reported.add(name)
+                if state['status'] == 'ready':
+                    print_colored(f"   ✓ {name} warm in {state['seconds']}s", Colors.GREEN)
+                else:
+                    print_colored(f"   ⚠️  {name} warm-up failed: {state['error']}", Colors.YELLOW)
+            if body.get('status') == 'ready':
+                return True
+            if body.get('status') == 'failed':
+                break  # a required step failed, waiting longer won't help
+        
+        time.sleep(0.5)
+    
+    # Failed or still warming after the timeout: carry on if the server is at least alive
+    try:
+        urllib.request.urlopen(f'{BACKEND_URL}/health', timeout=2)
+        print_colored("⚠️  Backend is up but not fully warmed; first requests may be slow", Colors.YELLOW)
+        return True
+    except Exception:
+        return False
+
 def start_servers():
     """Start both backend and frontend servers"""
     processes = []
@@ -67,15 +115,10 @@ def start_servers():
     )
     processes.append(backend_process)
     
-    # Wait for backend to start
-    time.sleep(3)
-    
-    # Check if backend is running
-    try:
-        import urllib.request
-        urllib.request.urlopen('http://localhost:5000/health')
+    # Wait for backend to finish warming up
+    if wait_for_backend(backend_process):
         print_colored("✅ Backend running on http://localhost:5000\n", Colors.GREEN)
-    except:
+    else:
         print_colored("❌ Failed to start backend", Colors.RED)
         backend_process.kill()
         sys.exit(1)
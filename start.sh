@@ -39,8 +39,21 @@ python app.py &
 BACKEND_PID=$!
 cd ..
 
-# Wait for backend to start
-sleep 3
+# Wait for backend warm-up (Ollama model load, Gemini client, caches)
+for _ in $(seq 1 360); do
+    READY_STATUS=$(curl -s http://localhost:5000/ready | python -c "import json, sys; print(json.load(sys.stdin).get('status', ''))" 2>/dev/null)
+    if [ "$READY_STATUS" = "ready" ]; then
+        break
+    fi
+    if [ "$READY_STATUS" = "failed" ]; then
+        echo -e "${RED}⚠️  Backend warm-up failed, see http://localhost:5000/ready${NC}"
+        break
+    fi
+    if ! kill -0 $BACKEND_PID 2>/dev/null; then
+        break
+    fi
+    sleep 0.5
+done
 
 # Check if backend is running
 if curl -s http://localhost:5000/health > /dev/null; then